@@ -2,12 +2,936 @@ import os
 import subprocess
 import json
 import base64
+import functools
+import gzip
+import operator
+import logging
 import re
+import shlex
+import shutil
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image
 from lxml import etree
 
+# C-accelerated HTML escaping when MarkupSafe is installed
+try:
+    from markupsafe import escape
+except ImportError:
+    from html import escape
+
+try:
+    import orjson
+except ImportError:  # optional speedup, the standard json module is used without it
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Static part of the WCAG coverage report, shared by every scanner instance
+WCAG_COVERAGE_RULES = [
+    {
+        "principle": "Perceivable",
+        "guideline": "1.1.1 Text Alternatives",
+        "description": "Provide text alternatives for any non-text content",
+        "status": "Covered"
+    },
+    {
+        "principle": "Perceivable",
+        "guideline": "1.3.1 Info and Relationships",
+        "description": "Information and relationships must be programmatically determinable",
+        "status": "Covered"
+    },
+]
+
+# Marks the end of each command's output in the persistent adb shell
+ADB_SHELL_SENTINEL = "__ADB_CMD_DONE__"
+# Seconds to wait for the persistent adb shell to exit before it is killed
+ADB_SHELL_EXIT_TIMEOUT = 5
+
+# Rows per block when testing all clickable pairs for overlap
+OVERLAP_TILE_ROWS = 256
+
+# Spellings of a true boolean attribute in a UI dump
+TRUE_VALUES = frozenset({"true", "True", "TRUE"})
+
+# Integers in a uiautomator bounds string such as "[0,63][1080,210]"
+BOUNDS_RE = re.compile(r"-?\d+")
+
+# Lower-cased link and button texts that don't describe their purpose
+UNCLEAR_LINK_TEXTS = frozenset({"click here", "read more", "link", "here", "this", "more info"})
+UNCLEAR_BUTTON_TEXTS = frozenset({"submit", "ok", "cancel", "yes", "no", "click", "button"})
+
+# Class-family bits in an element's "kind", set from substrings of its class name
+KIND_IMAGE = 1
+KIND_TEXT = 2
+KIND_BUTTON = 4
+KIND_FORM = 8
+FORM_CLASS_NAMES = ("EditText", "Spinner", "CheckBox", "RadioButton", "Switch", "SeekBar")
+
+# Colour cue words, matched anywhere in the lower-cased text
+COLOR_INDICATOR_RE = re.compile("red|green|blue|color|colored|highlighted|coloured")
+
+# Linear-light value of every 8-bit sRGB level, per the WCAG relative luminance definition
+_srgb_levels = np.arange(256) / 255
+SRGB_TO_LINEAR = np.where(_srgb_levels <= 0.03928, _srgb_levels / 12.92,
+                          ((_srgb_levels + 0.055) / 1.055) ** 2.4).astype(np.float32)
+del _srgb_levels
+
+# Static head of the HTML report: document metadata and the stylesheet
+REPORT_HEAD = """<!DOCTYPE html><html lang='en'><head>
+<meta charset='UTF-8'>
+<meta name='viewport' content='width=device-width, initial-scale=1.0'>
+<title>Mobile Accessibility Audit Report</title>
+<link rel='stylesheet' href='https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css'>
+<style>
+    :root {
+        --critical: #dc3545;
+        --high: #fd7e14;
+        --medium: #ffc107;
+        --low: #6c757d;
+        --success: #28a745;
+        --primary: #007bff;
+        --light: #f8f9fa;
+        --dark: #343a40;
+        --talkback-good: #28a745;
+        --talkback-moderate: #ffc107;
+        --talkback-limited: #fd7e14;
+        --talkback-poor: #dc3545;
+    }
+
+    * {
+        margin: 0;
+        padding: 0;
+        box-sizing: border-box;
+    }
+
+    body {
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+        line-height: 1.6;
+        color: #333;
+        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
+        min-height: 100vh;
+    }
+
+    .container {
+        max-width: 1200px;
+        margin: 0 auto;
+        padding: 20px;
+    }
+
+    header {
+        background: white;
+        border-radius: 12px;
+        padding: 30px;
+        margin-bottom: 30px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        text-align: center;
+    }
+
+    .logo {
+        font-size: 2.5rem;
+        color: var(--primary);
+        margin-bottom: 10px;
+    }
+
+    h1 {
+        color: var(--dark);
+        margin-bottom: 10px;
+        font-size: 2.2rem;
+    }
+
+    .subtitle {
+        color: #6c757d;
+        font-size: 1.1rem;
+        margin-bottom: 20px;
+    }
+
+    .talkback-evaluation-card {
+        background: white;
+        border-radius: 12px;
+        padding: 25px;
+        margin-bottom: 30px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        border-left: 6px solid;
+    }
+
+    .talkback-evaluation-card.good { border-left-color: var(--talkback-good); }
+    .talkback-evaluation-card.moderate { border-left-color: var(--talkback-moderate); }
+    .talkback-evaluation-card.limited { border-left-color: var(--talkback-limited); }
+    .talkback-evaluation-card.poor { border-left-color: var(--talkback-poor); }
+
+    .talkback-header {
+        display: flex;
+        align-items: center;
+        gap: 15px;
+        margin-bottom: 20px;
+    }
+
+    .talkback-icon {
+        font-size: 2rem;
+    }
+
+    .talkback-good .talkback-icon { color: var(--talkback-good); }
+    .talkback-moderate .talkback-icon { color: var(--talkback-moderate); }
+    .talkback-limited .talkback-icon { color: var(--talkback-limited); }
+    .talkback-poor .talkback-icon { color: var(--talkback-poor); }
+
+    .talkback-title {
+        font-size: 1.5rem;
+        color: var(--dark);
+    }
+
+    .talkback-status {
+        font-size: 1.2rem;
+        font-weight: bold;
+        padding: 5px 15px;
+        border-radius: 20px;
+        display: inline-block;
+        margin-left: 10px;
+    }
+
+    .talkback-good .talkback-status { 
+        background: var(--talkback-good); 
+        color: white;
+    }
+    .talkback-moderate .talkback-status { 
+        background: var(--talkback-moderate); 
+        color: black;
+    }
+    .talkback-limited .talkback-status { 
+        background: var(--talkback-limited); 
+        color: white;
+    }
+    .talkback-poor .talkback-status { 
+        background: var(--talkback-poor); 
+        color: white;
+    }
+
+    .talkback-details {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+        gap: 20px;
+        margin-top: 15px;
+    }
+
+    .talkback-detail {
+        background: #f8f9fa;
+        padding: 15px;
+        border-radius: 8px;
+        border-left: 4px solid;
+    }
+
+    .talkback-good .talkback-detail { border-left-color: var(--talkback-good); }
+    .talkback-moderate .talkback-detail { border-left-color: var(--talkback-moderate); }
+    .talkback-limited .talkback-detail { border-left-color: var(--talkback-limited); }
+    .talkback-poor .talkback-detail { border-left-color: var(--talkback-poor); }
+
+    .talkback-detail-label {
+        font-weight: 600;
+        color: var(--dark);
+        margin-bottom: 5px;
+        display: flex;
+        align-items: center;
+        gap: 8px;
+    }
+
+    .talkback-score {
+        font-size: 2rem;
+        font-weight: bold;
+        text-align: center;
+        margin: 10px 0;
+    }
+
+    .talkback-good .talkback-score { color: var(--talkback-good); }
+    .talkback-moderate .talkback-score { color: var(--talkback-moderate); }
+    .talkback-limited .talkback-score { color: var(--talkback-limited); }
+    .talkback-poor .talkback-score { color: var(--talkback-poor); }
+
+    .talkback-warning {
+        background: #fff3cd;
+        border-left: 4px solid #ffc107;
+        padding: 15px;
+        border-radius: 6px;
+        margin-top: 15px;
+    }
+
+    .talkback-warning h4 {
+        color: #856404;
+        margin-bottom: 5px;
+        display: flex;
+        align-items: center;
+        gap: 8px;
+    }
+
+    .score-card {
+        background: white;
+        border-radius: 12px;
+        padding: 25px;
+        text-align: center;
+        margin-bottom: 30px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }
+
+    .score-value {
+        font-size: 4rem;
+        font-weight: bold;
+        margin: 20px 0;
+    }
+
+    .score-excellent { color: var(--success); }
+    .score-good { color: var(--medium); }
+    .score-poor { color: var(--high); }
+    .score-critical { color: var(--critical); }
+
+    .summary-cards {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+        gap: 20px;
+        margin-bottom: 30px;
+    }
+
+    .summary-card {
+        background: white;
+        border-radius: 12px;
+        padding: 20px;
+        text-align: center;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        transition: transform 0.3s ease;
+    }
+
+    .summary-card:hover {
+        transform: translateY(-5px);
+    }
+
+    .summary-card.critical { border-top: 6px solid var(--critical); }
+    .summary-card.high { border-top: 6px solid var(--high); }
+    .summary-card.medium { border-top: 6px solid var(--medium); }
+    .summary-card.low { border-top: 6px solid var(--low); }
+
+    .summary-count {
+        font-size: 2.5rem;
+        font-weight: bold;
+        margin: 10px 0;
+    }
+
+    .summary-card.critical .summary-count { color: var(--critical); }
+    .summary-card.high .summary-count { color: var(--high); }
+    .summary-card.medium .summary-count { color: var(--medium); }
+    .summary-card.low .summary-count { color: var(--low); }
+
+    .screenshot-section {
+        background: white;
+        border-radius: 12px;
+        padding: 25px;
+        margin-bottom: 30px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }
+
+    .screenshot-container {
+        text-align: center;
+        margin-top: 15px;
+        position: relative;
+    }
+
+    .screenshot-img {
+        max-width: 100%;
+        max-height: 600px;
+        object-fit: contain;
+        border-radius: 8px;
+        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+        border: 2px solid #dee2e6;
+    }
+
+    .image-size {
+        position: absolute;
+        bottom: 10px;
+        right: 10px;
+        background: rgba(0,0,0,0.7);
+        color: white;
+        padding: 4px 8px;
+        border-radius: 4px;
+        font-size: 0.8rem;
+    }
+
+    .issues-section {
+        background: white;
+        border-radius: 12px;
+        padding: 25px;
+        margin-bottom: 30px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }
+
+    .section-title {
+        color: var(--dark);
+        margin-bottom: 20px;
+        padding-bottom: 10px;
+        border-bottom: 2px solid #e9ecef;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+    }
+
+    .section-title i {
+        font-size: 1.5rem;
+    }
+
+    .priority-section {
+        margin-bottom: 30px;
+    }
+
+    .priority-title {
+        color: var(--dark);
+        margin: 25px 0 15px 0;
+        padding-bottom: 8px;
+        border-bottom: 2px solid #e9ecef;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+    }
+
+    .issue {
+        border-radius: 8px;
+        margin: 15px 0;
+        overflow: hidden;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+    }
+
+    .issue.critical { border-left: 6px solid var(--critical); }
+    .issue.high { border-left: 6px solid var(--high); }
+    .issue.medium { border-left: 6px solid var(--medium); }
+    .issue.low { border-left: 6px solid var(--low); }
+
+    .accordion-header {
+        background: var(--light);
+        padding: 20px;
+        cursor: pointer;
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        transition: background 0.3s ease;
+    }
+
+    .accordion-header:hover {
+        background: #e9ecef;
+    }
+
+    .issue-title {
+        display: flex;
+        align-items: center;
+        gap: 10px;
+        font-weight: 600;
+    }
+
+    .issue-icon {
+        font-size: 1.2rem;
+    }
+
+    .issue.critical .issue-icon { color: var(--critical); }
+    .issue.high .issue-icon { color: var(--high); }
+    .issue.medium .issue-icon { color: var(--medium); }
+    .issue.low .issue-icon { color: var(--low); }
+
+    .accordion-icon {
+        transition: transform 0.3s ease;
+    }
+
+    .accordion.active .accordion-icon {
+        transform: rotate(180deg);
+    }
+
+    .accordion-content {
+        display: none;
+        padding: 20px;
+        background: white;
+        border-top: 1px solid #e9ecef;
+    }
+
+    .accordion.active .accordion-content {
+        display: block;
+    }
+
+    .issue-details {
+        display: grid;
+        grid-template-columns: 1fr 1fr;
+        gap: 20px;
+        margin-bottom: 15px;
+    }
+
+    @media (max-width: 768px) {
+        .issue-details {
+            grid-template-columns: 1fr;
+        }
+    }
+
+    .detail-group {
+        margin-bottom: 10px;
+    }
+
+    .detail-label {
+        font-weight: 600;
+        color: #6c757d;
+        margin-bottom: 5px;
+    }
+
+    .element-screenshot {
+        max-width: 300px;
+        max-height: 300px;
+        object-fit: contain;
+        border-radius: 6px;
+        border: 2px solid #dee2e6;
+        margin: 10px 0;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }
+
+    .copy-btn {
+        background: var(--primary);
+        color: white;
+        border: none;
+        padding: 5px 10px;
+        border-radius: 4px;
+        cursor: pointer;
+        font-size: 0.8rem;
+        margin-left: 10px;
+        transition: background 0.3s ease;
+    }
+
+    .copy-btn:hover {
+        background: #0056b3;
+    }
+
+    .xpath-container {
+        background: #f8f9fa;
+        padding: 10px;
+        border-radius: 4px;
+        border: 1px solid #e9ecef;
+        font-family: monospace;
+        font-size: 0.9rem;
+        word-break: break-all;
+        margin-top: 5px;
+    }
+
+    .issue-count {
+        background: #6c757d;
+        color: white;
+        padding: 2px 8px;
+        border-radius: 12px;
+        font-size: 0.8rem;
+        margin-left: 10px;
+    }
+
+    .all-instances {
+        margin-top: 15px;
+    }
+
+    .instance-item {
+        margin: 15px 0;
+        padding: 15px;
+        background: #f8f9fa;
+        border-radius: 6px;
+        border-left: 3px solid #dee2e6;
+    }
+
+    .instance-accordion {
+        margin: 10px 0;
+        border: 1px solid #dee2e6;
+        border-radius: 6px;
+        overflow: hidden;
+    }
+
+    .instance-header {
+        background: #f8f9fa;
+        padding: 12px 15px;
+        cursor: pointer;
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        transition: background 0.3s ease;
+    }
+
+    .instance-header:hover {
+        background: #e9ecef;
+    }
+
+    .instance-title {
+        font-weight: 600;
+        display: flex;
+        align-items: center;
+        gap: 8px;
+    }
+
+    .instance-icon {
+        font-size: 1rem;
+        color: #6c757d;
+    }
+
+    .instance-content {
+        display: none;
+        padding: 15px;
+        background: white;
+        border-top: 1px solid #dee2e6;
+    }
+
+    .instance-accordion.active .instance-content {
+        display: block;
+    }
+
+    .instance-screenshot {
+        max-width: 250px;
+        max-height: 250px;
+        object-fit: contain;
+        border-radius: 4px;
+        border: 1px solid #dee2e6;
+        margin: 8px 0;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+    }
+
+    .wcag-info {
+        background: #e7f3ff;
+        border-radius: 6px;
+        padding: 15px;
+        margin: 15px 0;
+        border-left: 4px solid var(--primary);
+    }
+
+    .wcag-section {
+        margin: 10px 0;
+    }
+
+    .wcag-section h4 {
+        color: var(--primary);
+        margin-bottom: 5px;
+        display: flex;
+        align-items: center;
+        gap: 8px;
+    }
+
+    .wcag-section p {
+        margin-left: 25px;
+    }
+
+    .guideline-badge {
+        background: var(--primary);
+        color: white;
+        padding: 4px 8px;
+        border-radius: 4px;
+        font-size: 0.8rem;
+        font-weight: 600;
+        margin-left: 10px;
+    }
+
+    .success-criteria {
+        background: #28a745;
+        color: white;
+        padding: 2px 6px;
+        border-radius: 3px;
+        font-size: 0.7rem;
+        margin-left: 8px;
+    }
+
+    .talkback-critical-badge {
+        background: #dc3545;
+        color: white;
+        padding: 2px 6px;
+        border-radius: 3px;
+        font-size: 0.7rem;
+        margin-left: 8px;
+        font-weight: bold;
+    }
+
+    footer {
+        text-align: center;
+        padding: 30px;
+        color: #6c757d;
+        font-size: 0.9rem;
+    }
+
+    .timestamp {
+        margin-top: 10px;
+        font-size: 0.8rem;
+        color: #adb5bd;
+    }
+</style>
+</head><body>"""
+
+# Report body up to the screenshot: header, TalkBack evaluation, score and summary cards
+REPORT_PREAMBLE = """<div class='container'>
+<header>
+<div class='logo'><i class='fas fa-mobile-alt'></i></div>
+<h1>Mobile Accessibility Audit Report</h1>
+<p class='subtitle'>Comprehensive analysis of your mobile application's accessibility compliance</p>
+</header>
+<div class='talkback-evaluation-card {talkback_class}'>
+<div class='talkback-header'>
+<i class='fas fa-assistive-listening-systems talkback-icon'></i>
+<h2 class='talkback-title'>TalkBack Support: <span class='talkback-status'>{support_level}</span></h2>
+</div>
+<div class='talkback-score'>{support_score}%</div>
+<div class='talkback-details'>
+<div class='talkback-detail'>
+<div class='talkback-detail-label'><i class='fas fa-info-circle'></i> Device Detection</div>
+<div>{device_status}</div>
+<small>{details}</small>
+</div>
+<div class='talkback-detail'>
+<div class='talkback-detail-label'><i class='fas fa-check-circle'></i> Content Support</div>
+<div>{content_status}</div>
+<small>{reason}</small>
+</div>
+<div class='talkback-detail'>
+<div class='talkback-detail-label'><i class='fas fa-bug'></i> Critical Issues</div>
+<div>{critical_issues} TalkBack-critical issues</div>
+<small>Missing labels: {missing_labels}</small>
+</div>
+</div>
+{missing_labels_warning}</div>
+<div class='score-card'>
+<h2><i class='fas fa-chart-line'></i> Overall Accessibility Score</h2>
+<div class='score-value {score_class}'>{audit_score}%</div>
+<p>Based on analysis of {total_issues} accessibility issues</p>
+</div>
+<div class='summary-cards'>
+{summary_cards}
+</div>{talkback_critical_cards}
+"""
+
+REPORT_MISSING_LABELS_WARNING = """<div class='talkback-warning'>
+<h4><i class='fas fa-exclamation-triangle'></i> Important Note</h4>
+<p>Found {count} missing labels. While TalkBack may technically work, users will struggle to navigate and understand unlabeled elements.</p>
+</div>
+"""
+
+REPORT_SUMMARY_CARD = """<div class='summary-card {priority}'>
+<h3>{title}</h3>
+<div class='summary-count'>{count}</div>
+<p>Issues</p>
+</div>"""
+
+REPORT_TALKBACK_CRITICAL_CARDS = """
+<div class='summary-cards'>
+<div class='summary-card critical'>
+<h3>TalkBack Critical</h3>
+<div class='summary-count'>{count}</div>
+<p>Issues preventing TalkBack use</p>
+</div>
+</div>"""
+
+# One instance accordion up to its optional element screenshot; the optional detail
+# blocks are passed in pre-rendered or empty, and REPORT_INSTANCE_END closes it
+REPORT_INSTANCE = """<div class='instance-accordion'>
+<div class='instance-header'>
+<div class='instance-title'>
+<i class='instance-icon fas fa-bug'></i>
+Instance {number}: {message}
+</div>
+<i class='accordion-icon fas fa-chevron-down'></i>
+</div>
+<div class='instance-content'>
+<div class='issue-details'>
+<div>
+<div class='detail-group'><div class='detail-label'>Issue Details</div><div>{message}</div></div>
+<div class='wcag-info' style='background: #fff3cd; border-left-color: #ffc107;'>
+<div class='detail-group'><div class='detail-label'>WCAG Guideline</div><div>{guideline}</div></div>
+{contrast}{talkback}</div>
+</div>
+<div>
+{position}{xpath}</div>
+</div>
+"""
+
+REPORT_INSTANCE_SCREENSHOT = """<div class='detail-group'><div class='detail-label'>Element Screenshot</div>
+<img class='instance-screenshot' src='"""
+
+REPORT_INSTANCE_SCREENSHOT_END = """' {attrs}alt='Element with accessibility issue - Instance {number}'/>
+</div>
+"""
+
+REPORT_INSTANCE_END = "</div></div>\n"
+
+REPORT_FOOTER = """<footer>
+<p>Design and developed by <b>ACOE</b> - Automation Center of Excellence</p>
+<div class='timestamp'>Report generated on {timestamp}</div>
+</footer>
+"""
+
+# Static tail of the HTML report: accordion and copy-to-clipboard scripts
+REPORT_SCRIPT = """<script>
+    function copyText(id){
+        const el = document.getElementById(id);
+        navigator.clipboard.writeText(el.innerText).then(() => {
+            const btn = event.target;
+            const originalText = btn.innerHTML;
+            btn.innerHTML = '<i class="fas fa-check"></i> Copied!';
+            setTimeout(() => {
+                btn.innerHTML = originalText;
+            }, 2000);
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', () => {
+        // Main accordion functionality
+        document.querySelectorAll('.accordion-header').forEach(header => {
+            header.addEventListener('click', () => {
+                const accordion = header.parentElement;
+                accordion.classList.toggle('active');
+            });
+        });
+
+        // Instance accordion functionality
+        document.querySelectorAll('.instance-header').forEach(header => {
+            header.addEventListener('click', () => {
+                const accordion = header.parentElement;
+                accordion.classList.toggle('active');
+            });
+        });
+
+        // Auto-expand critical issues and TalkBack-critical issues
+        document.querySelectorAll('.issue.critical').forEach(accordion => {
+            accordion.classList.add('active');
+            // Also expand first instance of critical issues
+            const firstInstance = accordion.querySelector('.instance-accordion');
+            if (firstInstance) {
+                firstInstance.classList.add('active');
+            }
+        });
+
+        // Auto-expand any issues with talkback-critical class
+        document.querySelectorAll('.talkback-critical-badge').forEach(badge => {
+            const accordion = badge.closest('.accordion');
+            if (accordion) {
+                accordion.classList.add('active');
+            }
+        });
+    });
+</script>
+</body></html>"""
+
+def stream_base64(path, write):
+    '''Base64-encode the file at path into write() chunk by chunk'''
+    # 57 KiB is a multiple of 3, so chunks encode without padding in between
+    with open(path, "rb") as src:
+        while chunk := src.read(57 * 1024):
+            write(base64.b64encode(chunk).decode("ascii"))
+
+def log_adb_stderr(stream):
+    '''Log each stderr line of the persistent adb shell until it closes'''
+    for line in stream:
+        line = line.strip()
+        if line:
+            logger.error("ADB Error: %s", line)
+
+def stop_adb_shell(proc):
+    '''Close the adb shell's stdin and wait for it to exit, killing it if it does not'''
+    if proc.poll() is None:
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=ADB_SHELL_EXIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+def texts_overlap(a, b):
+    '''True if one normalised text contains the other; only the shorter can fit inside the longer'''
+    if len(a) > len(b):
+        a, b = b, a
+    return a in b
+
+class ElementTable:
+    '''Parsed UI elements with struct-of-arrays columns for the geometric rule checks'''
+
+    def __init__(self, elements):
+        self.elements = elements
+        bounds, has_bounds, clickable, focusable, kind = [], [], [], [], []
+        for element in elements:
+            has_bounds.append(bool(element["bounds"]))
+            bounds.append(element["bounds"] or (0, 0, 0, 0))
+            clickable.append(element["clickable"])
+            focusable.append(element["focusable"])
+            kind.append(element["kind"])
+        self.bounds = np.array(bounds, dtype=np.int32).reshape(-1, 4)
+        self.has_bounds = np.array(has_bounds, dtype=bool)
+        self.clickable = np.array(clickable, dtype=bool)
+        self.focusable = np.array(focusable, dtype=bool)
+        self.kind = np.array(kind, dtype=np.int32)
+        self._buckets = {}
+
+    @classmethod
+    def wrap(cls, elements):
+        '''Return elements unchanged if already a table, otherwise build one'''
+        return elements if isinstance(elements, cls) else cls(elements)
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __getitem__(self, index):
+        return self.elements[index]
+
+    @functools.cached_property
+    def target_sizes(self):
+        '''Indices, widths and heights of the clickable elements that have bounds'''
+        indices = np.flatnonzero(self.has_bounds & self.clickable)
+        bounds = self.bounds[indices]
+        return indices, bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1]
+
+    def bucket(self, kinds):
+        '''Elements whose class family matches any of the KIND_* bits in kinds, in document order'''
+        if kinds not in self._buckets:
+            self._buckets[kinds] = [self.elements[index] for index in np.flatnonzero(self.kind & kinds)]
+        return self._buckets[kinds]
+
 class ComprehensiveMobileAccessibilityScanner:
+    # Rule checks in the order they run, as (rule id, check method name). Text spacing,
+    # focus visible, page language, consistent navigation and error suggestion can't be
+    # detected from a single dump; their check methods find nothing and are not dispatched
+    RULE_CHECKS = (
+        ("text-alternatives", "check_text_alternatives"),
+        ("info-relationships", "check_info_relationships"),
+        ("color-not-only", "check_color_not_only"),
+        ("color-contrast", "check_color_contrast"),
+        ("images-of-text", "check_images_of_text"),
+        ("focus-order", "check_focus_order"),
+        ("link-purpose", "check_link_purpose"),
+        ("pointer-gestures", "check_pointer_gestures"),
+        ("label-in-name", "check_label_in_name"),
+        ("touch-target-size", "check_touch_target_size"),
+        ("enhanced-target-size", "check_enhanced_target_size"),
+        ("name-role-value", "check_name_role_value"),
+        ("mobile-touch-target", "check_mobile_touch_target"),
+        ("missing-labels", "check_missing_labels"),
+        ("image-descriptions", "check_image_descriptions"),
+        ("overlapping-elements", "check_overlapping_elements"),
+        ("form-labels", "check_form_labels"),
+        ("button-purpose", "check_button_purpose"),
+    )
+
+    # Fonts by point size, filled by _load_font
+    _fonts = {}
+
+    # Rules evaluated element by element in run_element_checks, with their default priority
+    ELEMENT_RULES = {
+        "text-alternatives": "critical",
+        "info-relationships": "high",
+        "color-not-only": "high",
+        "images-of-text": "medium",
+        "link-purpose": "high",
+        "pointer-gestures": "medium",
+        "label-in-name": "high",
+        "name-role-value": "high",
+        "missing-labels": "critical",
+        "image-descriptions": "critical",
+        "form-labels": "high",
+        "button-purpose": "high",
+    }
+
     def __init__(self, rules_config=None):
         self.screenshot_dir = "screenshots"
         self.report_dir = "reports"
@@ -15,9 +939,6 @@ class ComprehensiveMobileAccessibilityScanner:
         os.makedirs(self.screenshot_dir, exist_ok=True)
         os.makedirs(self.report_dir, exist_ok=True)
 
-        # Load WCAG rules coverage
-        self.wcag_coverage = self.load_wcag_coverage()
-        
         # Enhanced rules configuration with detailed WCAG descriptions
         self.default_rules = {
             # Perceivable - Text Alternatives
@@ -313,6 +1234,36 @@ class ComprehensiveMobileAccessibilityScanner:
         # Load custom rules if provided
         self.rules = self.load_rules_config(rules_config)
         
+        # Rules are fixed after loading, so resolve the enabled checks once. Method
+        # names rather than bound methods, so the scanner holds no reference to itself
+        self._enabled_rule_checks = tuple(
+            (rule_id, method_name)
+            for rule_id, method_name in self.RULE_CHECKS
+            if self.rules.get(rule_id, {}).get('enabled', True)
+        )
+        
+        # WCAG details copied onto every issue of a rule, prepared once per rule
+        self._rule_enrichment = {
+            rule_id: {
+                "guideline": rule.get("guideline", ""),
+                "wcag_description": rule.get("wcag_description", ""),
+                "why_it_matters": rule.get("why_it_matters", ""),
+                "how_to_fix": rule.get("how_to_fix", ""),
+                "success_criteria": rule.get("success_criteria", ""),
+                "talkback_critical": rule.get("talkback_critical", False)
+            }
+            for rule_id, rule in self.rules.items()
+        }
+        
+        # Decoded screenshot pixels and their relative luminance, each keyed by
+        # the screenshot path they came from
+        self._screenshot_cache = {}
+        self._luminance_cache = {}
+        
+        # Contrast ratios already measured, keyed by (screenshot, bounds); cleared when
+        # a different screenshot is loaded
+        self._contrast_cache = {}
+
         # Track analysis results
         self.analysis_results = {
             "total_issues": 0,
@@ -322,6 +1273,14 @@ class ComprehensiveMobileAccessibilityScanner:
             "talkback_support_score": 0
         }
         
+        # Long-lived `adb shell` used by adb_exec, started on first use; the finalizer
+        # stops it when the scanner is closed or garbage collected. Once it fails to
+        # start or dies (no device, offline, unauthorized) it stays disabled
+        self._adb_shell = None
+        self._adb_shell_finalizer = None
+        self._adb_shell_disabled = False
+        self._adb_shell_lock = threading.Lock()
+        
         # Check TalkBack status on device
         self.talkback_status = self.check_talkback_status()
         
@@ -460,21 +1419,13 @@ class ComprehensiveMobileAccessibilityScanner:
                 "covered_rules": 32,
                 "pending_rules": 88
             },
-            "rules": [
-                {
-                    "principle": "Perceivable",
-                    "guideline": "1.1.1 Text Alternatives",
-                    "description": "Provide text alternatives for any non-text content",
-                    "status": "Covered"
-                },
-                {
-                    "principle": "Perceivable",
-                    "guideline": "1.3.1 Info and Relationships",
-                    "description": "Information and relationships must be programmatically determinable",
-                    "status": "Covered"
-                },
-            ]
+            "rules": WCAG_COVERAGE_RULES
         }
+
+    @functools.cached_property
+    def wcag_coverage(self):
+        '''WCAG coverage data, built on first access rather than at construction'''
+        return self.load_wcag_coverage()
         
     def load_rules_config(self, rules_config):
         '''Load rules configuration from JSON or use defaults'''
@@ -483,20 +1434,25 @@ class ComprehensiveMobileAccessibilityScanner:
             
         if isinstance(rules_config, str):
             try:
-                with open(rules_config, 'r') as f:
-                    custom_rules = json.load(f)
+                with open(rules_config, 'rb') as f:
+                    custom_rules = orjson.loads(f.read()) if orjson else json.load(f)
             except FileNotFoundError:
-                print("Rules config file not found: " + rules_config + ", using defaults")
+                logger.warning("Rules config file not found: %s, using defaults", rules_config)
                 return self.default_rules
         else:
             custom_rules = rules_config
             
-        merged_rules = self.default_rules.copy()
+        # Untouched rules share the default dicts; overridden rules get a fresh
+        # merged dict so the defaults themselves are never modified
+        merged_rules = dict(self.default_rules)
         for rule_id, rule_config in custom_rules.items():
-            if rule_id in merged_rules:
-                merged_rules[rule_id].update(rule_config)
-            else:
-                merged_rules[rule_id] = rule_config
+            # Rule ids and priorities read from JSON are interned like the default
+            # literals, so the per-issue dict lookups on them hit the identity fast path
+            rule_id = sys.intern(rule_id)
+            merged = {**merged_rules.get(rule_id, {}), **rule_config}
+            if isinstance(merged.get("priority"), str):
+                merged["priority"] = sys.intern(merged["priority"])
+            merged_rules[rule_id] = merged
                 
         return merged_rules
 
@@ -504,97 +1460,259 @@ class ComprehensiveMobileAccessibilityScanner:
     # ADB and Capture Methods
     # ---------------------------
     def adb_exec(self, cmd):
+        # Shell commands reuse one long-lived `adb shell` instead of a new adb process each;
+        # if that shell is unavailable the command falls back to a one-shot adb call
+        if cmd and cmd[0] == "shell":
+            with self._adb_shell_lock:
+                session = self._adb_shell_session()
+                if session is not None:
+                    output = self._adb_shell_exec(session, cmd[1:])
+                    if output is not None:
+                        return output
         result = subprocess.run(["adb"] + cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
         if result.returncode != 0:
-            print("ADB Error: " + result.stderr)
+            logger.error("ADB Error: %s", result.stderr.strip() or f"adb exited with status {result.returncode}")
         return result.stdout.strip()
 
+    def _adb_shell_session(self):
+        '''Return the persistent adb shell, starting it if needed; None if it is unavailable.
+        Called with _adb_shell_lock held'''
+        if self._adb_shell_disabled:
+            return None
+        if self._adb_shell is not None:
+            if self._adb_shell.poll() is None:
+                return self._adb_shell
+            self._disable_adb_shell("it exited")
+            return None
+        try:
+            proc = subprocess.Popen(["adb", "shell"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, text=True)
+        except OSError as e:
+            self._disable_adb_shell(f"it could not start: {e}")
+            return None
+        # stderr is drained on its own thread so it is logged, never returned as output,
+        # and a full pipe cannot stall the shell
+        threading.Thread(target=log_adb_stderr, args=(proc.stderr,), daemon=True).start()
+        self._adb_shell = proc
+        self._adb_shell_finalizer = weakref.finalize(self, stop_adb_shell, proc)
+        return proc
+
+    def _disable_adb_shell(self, reason):
+        '''Give up on the persistent adb shell for the rest of this scanner's life'''
+        logger.warning("Persistent adb shell unavailable (%s); using one-shot adb commands", reason)
+        self._drop_adb_shell(kill=True)
+        self._adb_shell_disabled = True
+
+    def _drop_adb_shell(self, kill=False):
+        '''Stop and forget the persistent adb shell, if any'''
+        if kill and self._adb_shell is not None:
+            self._adb_shell.kill()
+        if self._adb_shell_finalizer is not None:
+            self._adb_shell_finalizer()
+        self._adb_shell = None
+        self._adb_shell_finalizer = None
+
+    def _adb_shell_exec(self, session, args):
+        '''Run one command in the persistent shell and read its output up to the sentinel line;
+        None if the shell died, so the caller can retry with a one-shot adb call.
+        Called with _adb_shell_lock held'''
+        command = " ".join(shlex.quote(arg) for arg in args)
+        output = []
+        returncode = None
+        try:
+            # The extra echo guarantees the sentinel starts on its own line
+            session.stdin.write(f"{command}; __rc=$?; echo; echo {ADB_SHELL_SENTINEL}$__rc\n")
+            session.stdin.flush()
+            for line in session.stdout:
+                if line.startswith(ADB_SHELL_SENTINEL):
+                    returncode = int(line[len(ADB_SHELL_SENTINEL):])
+                    break
+                output.append(line)
+        except (OSError, ValueError) as e:
+            # A broken pipe, or a pipe already closed under us
+            self._disable_adb_shell(f"it failed: {e}")
+            return None
+        if returncode is None:
+            # The shell exited before the sentinel; any output read is incomplete
+            self._disable_adb_shell("it exited mid-command")
+            return None
+        output = "".join(output).strip()
+        if returncode != 0:
+            logger.error("ADB Error: command exited with status %d", returncode)
+        return output
+
+    def close(self):
+        '''Shut down the persistent adb shell, if one was started'''
+        with self._adb_shell_lock:
+            self._drop_adb_shell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def capture_state(self):
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         screenshot_file = os.path.join(self.screenshot_dir, "screenshot_" + ts + ".png")
         xml_file = os.path.join(self.report_dir, "uidump_" + ts + ".xml")
 
-        # Capture screenshot
-        screenshot_result = subprocess.run("adb exec-out screencap -p > " + screenshot_file, 
-                                         shell=True, capture_output=True, text=True)
-        if screenshot_result.returncode != 0:
-            print("Screenshot capture failed: " + screenshot_result.stderr)
-        
-        # Capture UI hierarchy
-        self.adb_exec(["shell", "uiautomator", "dump", "/sdcard/uidump.xml"])
-        self.adb_exec(["pull", "/sdcard/uidump.xml", xml_file])
+        # Capture screenshot in the background; it is independent of the UI dump.
+        # adb writes the PNG straight into the file, no shell redirect involved
+        with open(screenshot_file, "wb") as screenshot_out:
+            screenshot_proc = subprocess.Popen(["adb", "exec-out", "screencap", "-p"],
+                                               stdout=screenshot_out, stderr=subprocess.PIPE, text=True)
+            
+            # Capture UI hierarchy while the screenshot is being taken
+            self.adb_exec(["shell", "uiautomator", "dump", "/sdcard/uidump.xml"])
+            self.adb_exec(["pull", "/sdcard/uidump.xml", xml_file])
+            
+            _, screenshot_err = screenshot_proc.communicate()
+        if screenshot_proc.returncode != 0:
+            logger.error("Screenshot capture failed: %s", screenshot_err)
         
         return screenshot_file, xml_file
 
     def parse_bounds(self, bounds_str):
-        try:
-            parts = bounds_str.replace("][", ",").replace("[", "").replace("]", "").split(",")
-            x1, y1, x2, y2 = map(int, parts)
-            x1, x2 = min(x1, x2), max(x1, x2)
-            y1, y2 = min(y1, y2), max(y1, y2)
-            return (x1, y1, x2, y2)
-        except:
+        values = BOUNDS_RE.findall(bounds_str)
+        if len(values) != 4:
             return None
+        x1, y1, x2, y2 = map(int, values)
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        return (x1, y1, x2, y2)
+
+    def _iter_nodes(self, xml_file):
+        '''Stream <node> elements with their positional XPath, freeing each one once parsed'''
+        path_stack = []
+        for event, element in etree.iterparse(xml_file, events=("start", "end"), recover=True):
+            if event == "end":
+                path_stack.pop()
+                element.clear()
+                # Drop finished siblings so the partially built tree stays small
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+                continue
+
+            # Later siblings are not parsed yet, so every step carries its index
+            if path_stack:
+                parent_path, sibling_counts = path_stack[-1]
+                position = sibling_counts.get(element.tag, 0) + 1
+                sibling_counts[element.tag] = position
+                element_path = f"{parent_path}/{element.tag}[{position}]"
+            else:
+                element_path = "/" + element.tag
+            path_stack.append((element_path, {}))
+
+            if element.tag == "node":
+                yield element, element_path
 
-    def get_formatted_xpath(self, element):
+    def get_formatted_xpath(self, element, standard_xpath=None):
         try:
-            standard_xpath = element.getroottree().getpath(element)
-            class_name = element.get('class', '').split('.')[-1]
-            text = element.get('text', '')
-            content_desc = element.get('content-desc', '')
-            resource_id = element.get('resource-id', '')
+            class_name = element.get('class', '').rpartition('.')[2]
             
+            resource_id = element.get('resource-id', '')
             if resource_id:
-                return "//" + class_name + "[@resource-id='" + resource_id + "']"
-            elif content_desc:
-                return "//" + class_name + "[@content-desc='" + content_desc + "']"
-            elif text:
-                return "//" + class_name + "[@text='" + text + "']"
-            else:
-                return standard_xpath
+                return f"//{class_name}[@resource-id='{resource_id}']"
+            content_desc = element.get('content-desc', '')
+            if content_desc:
+                return f"//{class_name}[@content-desc='{content_desc}']"
+            text = element.get('text', '')
+            if text:
+                return f"//{class_name}[@text='{text}']"
+            # Only walk up to the root when no attribute-based locator exists
+            if standard_xpath is None:
+                standard_xpath = element.getroottree().getpath(element)
+            return standard_xpath
         except Exception as e:
-            print("XPath generation error: " + str(e))
+            logger.warning("XPath generation error: %s", e)
             return ""
 
+    def _load_screenshot_array(self, screenshot_file):
+        '''Decode the screenshot once and reuse the RGB array until the path changes'''
+        if screenshot_file not in self._screenshot_cache:
+            img_arr = None
+            if os.path.exists(screenshot_file):
+                with Image.open(screenshot_file) as img:
+                    img_arr = np.asarray(img.convert("RGB"))
+            self._screenshot_cache = {screenshot_file: img_arr}
+            self._contrast_cache = {}
+        return self._screenshot_cache[screenshot_file]
+
+    def _luminance_plane(self, screenshot_file):
+        '''WCAG relative luminance of every screenshot pixel, computed once per screenshot'''
+        if screenshot_file not in self._luminance_cache:
+            luminance = None
+            img_arr = self._load_screenshot_array(screenshot_file)
+            if img_arr is not None:
+                luminance = (0.2126 * SRGB_TO_LINEAR[img_arr[..., 0]] +
+                             0.7152 * SRGB_TO_LINEAR[img_arr[..., 1]] +
+                             0.0722 * SRGB_TO_LINEAR[img_arr[..., 2]])
+            self._luminance_cache = {screenshot_file: luminance}
+        return self._luminance_cache[screenshot_file]
+
+    def _sample_region(self, screenshot_file, bounds, luminance=False):
+        '''Return a view of the screenshot (or its luminance) inside bounds, or None if empty'''
+        if luminance:
+            pixels = self._luminance_plane(screenshot_file)
+        else:
+            pixels = self._load_screenshot_array(screenshot_file)
+        if pixels is None:
+            return None
+        x1, y1, x2, y2 = bounds
+        region = pixels[max(y1, 0):y2, max(x1, 0):x2]
+        return region if region.size else None
+
     def calculate_color_contrast(self, screenshot_file, bounds):
-        if not screenshot_file or not os.path.exists(screenshot_file) or not bounds:
+        if not screenshot_file or not bounds:
             return None
         try:
             x1, y1, x2, y2 = bounds
             if x1 >= x2 or y1 >= y2:
                 return None
-            img = Image.open(screenshot_file).convert("RGB")
-            region = img.crop((x1, y1, x2, y2))
-            pixels = list(region.getdata())
-            if not pixels:
-                return None
-            r_avg = sum(p[0] for p in pixels)/len(pixels)
-            g_avg = sum(p[1] for p in pixels)/len(pixels)
-            b_avg = sum(p[2] for p in pixels)/len(pixels)
-            luminance = (0.2126*r_avg + 0.7152*g_avg + 0.0722*b_avg)/255
-            contrast_ratio = (luminance + 0.05) / (1.0 + 0.05)
-            contrast_ratio = max(contrast_ratio, 1/contrast_ratio)
-            return round(contrast_ratio, 2)
+            key = (screenshot_file, tuple(bounds))
+            if key not in self._contrast_cache:
+                self._contrast_cache[key] = self._measure_contrast(screenshot_file, key[1])
+            return self._contrast_cache[key]
         except Exception as e:
-            print("Color contrast calculation error: " + str(e))
+            logger.warning("Color contrast calculation error: %s", e)
+            return None
+
+    def _measure_contrast(self, screenshot_file, bounds):
+        '''Contrast ratio between the two dominant colours inside bounds'''
+        region = self._sample_region(screenshot_file, bounds)
+        if region is None:
+            return None
+        pixels = region.reshape(-1, 3)
+        luminance = self._sample_region(screenshot_file, bounds, luminance=True).ravel()
+        
+        # Quantise to 5 bits per channel; the two most common colours are taken
+        # as background and text
+        quantised = (pixels >> 3).astype(np.int32)
+        keys = (quantised[:, 0] << 10) | (quantised[:, 1] << 5) | quantised[:, 2]
+        counts = np.bincount(keys, minlength=1 << 15)
+        dominant = np.argpartition(counts, -2)[-2:]
+        dominant = dominant[counts[dominant] > 0]
+        if len(dominant) < 2:
+            # A solid region has no text/background pair to compare
             return None
+        levels = [luminance[keys == key].mean() for key in dominant]
+        
+        contrast_ratio = (max(levels) + 0.05) / (min(levels) + 0.05)
+        return round(float(contrast_ratio), 2)
 
     # ---------------------------
     # Enhanced Analysis Methods for WCAG Coverage
     # ---------------------------
     def analyze_accessibility(self, xml_file, screenshot_file):
         if not os.path.exists(xml_file):
-            print("XML file not found: " + xml_file)
-            return []
-            
-        parser = etree.XMLParser(recover=True)
-        try:
-            tree = etree.parse(xml_file, parser)
-            root = tree.getroot()
-        except Exception as e:
-            print("Error parsing XML: " + str(e))
+            logger.warning("XML file not found: %s", xml_file)
             return []
             
+        # Decode the screenshot up front so every per-element check shares it
+        if screenshot_file:
+            self._luminance_plane(screenshot_file)
+
         issues = []
         all_elements = []
         clickable_elements = []
@@ -602,67 +1720,65 @@ class ComprehensiveMobileAccessibilityScanner:
         form_elements = []
 
         # First pass: collect all elements and basic information
-        for node in root.iter("node"):
-            bounds_str = node.attrib.get("bounds")
-            coords = self.parse_bounds(bounds_str) if bounds_str else None
-            
-            element_data = {
-                "node": node,
-                "bounds": coords,
-                "text": node.attrib.get("text", "").strip(),
-                "content_desc": node.attrib.get("content-desc", "").strip(),
-                "clickable": node.attrib.get("clickable", "false") == "true",
-                "focusable": node.attrib.get("focusable", "false") == "true",
-                "long_clickable": node.attrib.get("long-clickable", "false") == "true",
-                "checkable": node.attrib.get("checkable", "false") == "true",
-                "checked": node.attrib.get("checked", "false") == "true",
-                "class": node.attrib.get("class", ""),
-                "resource_id": node.attrib.get("resource-id", ""),
-                "package": node.attrib.get("package", ""),
-                "xpath": self.get_formatted_xpath(node) if coords else ""
-            }
+        try:
+            for node, node_path in self._iter_nodes(xml_file):
+                # Copy the attributes out once instead of going through the lxml proxy per key
+                attrs = dict(node.attrib)
+                bounds_str = attrs.get("bounds")
+                coords = self.parse_bounds(bounds_str) if bounds_str else None
+            
+                element_data = {
+                    "bounds": coords,
+                    "text": attrs.get("text", "").strip(),
+                    "content_desc": attrs.get("content-desc", "").strip(),
+                    "clickable": attrs.get("clickable") in TRUE_VALUES,
+                    "focusable": attrs.get("focusable") in TRUE_VALUES,
+                    "long_clickable": attrs.get("long-clickable") in TRUE_VALUES,
+                    "checkable": attrs.get("checkable") in TRUE_VALUES,
+                    "checked": attrs.get("checked") in TRUE_VALUES,
+                    "class": attrs.get("class", ""),
+                    "resource_id": attrs.get("resource-id", ""),
+                    "package": attrs.get("package", ""),
+                    "xpath": self.get_formatted_xpath(node, node_path) if coords else ""
+                }
+                element_data["kind"] = self.class_kind(element_data["class"])
+                # Top-left corner as (y, x), the reading-order sort key for focus order
+                element_data["yx"] = (coords[1], coords[0]) if coords else None
+                # Lower-cased once here for the text heuristics in the rule checks
+                element_data["text_lower"] = element_data["text"].lower()
+                element_data["content_desc_lower"] = element_data["content_desc"].lower()
             
-            all_elements.append(element_data)
+                all_elements.append(element_data)
             
-            if element_data["clickable"]:
-                clickable_elements.append(element_data)
+                if element_data["clickable"]:
+                    clickable_elements.append(element_data)
                 
-            if element_data["focusable"]:
-                focusable_elements.append(element_data)
+                if element_data["focusable"]:
+                    focusable_elements.append(element_data)
                 
-            if self.is_form_element(element_data):
-                form_elements.append(element_data)
-
-        # Run all enabled rule checks
-        rule_checks = [
-            ("text-alternatives", self.check_text_alternatives),
-            ("info-relationships", self.check_info_relationships),
-            ("color-not-only", self.check_color_not_only),
-            ("color-contrast", self.check_color_contrast),
-            ("images-of-text", self.check_images_of_text),
-            ("text-spacing", self.check_text_spacing),
-            ("focus-order", self.check_focus_order),
-            ("link-purpose", self.check_link_purpose),
-            ("focus-visible", self.check_focus_visible),
-            ("pointer-gestures", self.check_pointer_gestures),
-            ("label-in-name", self.check_label_in_name),
-            ("touch-target-size", self.check_touch_target_size),
-            ("enhanced-target-size", self.check_enhanced_target_size),
-            ("page-language", self.check_page_language),
-            ("consistent-navigation", self.check_consistent_navigation),
-            ("error-suggestion", self.check_error_suggestion),
-            ("name-role-value", self.check_name_role_value),
-            ("mobile-touch-target", self.check_mobile_touch_target),
-            ("missing-labels", self.check_missing_labels),
-            ("image-descriptions", self.check_image_descriptions),
-            ("overlapping-elements", self.check_overlapping_elements),
-            ("form-labels", self.check_form_labels),
-            ("button-purpose", self.check_button_purpose),
-        ]
-        
-        for rule_id, check_method in rule_checks:
-            if self.rules.get(rule_id, {}).get('enabled', True):
-                rule_issues = check_method(all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file)
+                if self.is_form_element(element_data):
+                    form_elements.append(element_data)
+        except (etree.XMLSyntaxError, OSError) as e:
+            # Only failures reading or parsing the dump; anything else is a bug and propagates
+            logger.error("Error parsing XML: %s", e)
+            return []
+
+        all_elements = ElementTable(all_elements)
+
+        # Run all enabled rule checks. They only read the shared element data and
+        # screenshot array, so they run side by side; results are merged in rule order.
+        # The cheap per-element rules share one pass over the elements as a single task
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            fused_rules = [rule_id for rule_id, _ in self._enabled_rule_checks if rule_id in self.ELEMENT_RULES]
+            fused = executor.submit(self.run_element_checks, all_elements, fused_rules)
+            futures = {
+                rule_id: executor.submit(getattr(self, method_name), all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file)
+                for rule_id, method_name in self._enabled_rule_checks
+                if rule_id not in self.ELEMENT_RULES
+            }
+            fused_issues = fused.result()
+            for rule_id, _ in self._enabled_rule_checks:
+                rule_issues = fused_issues[rule_id] if rule_id in fused_issues else futures[rule_id].result()
                 if rule_issues:
                     issues.extend(rule_issues)
                     
@@ -673,113 +1789,159 @@ class ComprehensiveMobileAccessibilityScanner:
 
         # Add WCAG details to each issue
         for issue in issues:
-            rule_id = issue["rule"]
-            if rule_id in self.rules:
-                issue.update({
-                    "guideline": self.rules[rule_id].get("guideline", ""),
-                    "wcag_description": self.rules[rule_id].get("wcag_description", ""),
-                    "why_it_matters": self.rules[rule_id].get("why_it_matters", ""),
-                    "how_to_fix": self.rules[rule_id].get("how_to_fix", ""),
-                    "success_criteria": self.rules[rule_id].get("success_criteria", ""),
-                    "talkback_critical": self.rules[rule_id].get("talkback_critical", False)
-                })
+            enrichment = self._rule_enrichment.get(issue["rule"])
+            if enrichment:
+                issue.update(enrichment)
 
-        # Deduplicate issues
-        unique = []
-        seen = set()
+        # Deduplicate issues, keeping the first one reported per bounds and rule.
+        # parse_bounds already yields hashable tuples; elements without bounds share ()
+        first_by_key = {}
         for i in issues:
-            key = (tuple(i.get("bounds", ())), i["rule"])
-            if key not in seen:
-                unique.append(i)
-                seen.add(key)
+            first_by_key.setdefault((i.get("bounds") or (), i["rule"]), i)
+        unique = list(first_by_key.values())
 
         # Evaluate TalkBack support based on actual issues
         self.talkback_evaluation = self.evaluate_talkback_support(unique)
         
         return unique
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def class_kind(class_name):
+        '''Class-family bitmask (KIND_*) for a widget class name, computed once per distinct name'''
+        kind = 0
+        if "ImageView" in class_name:
+            kind |= KIND_IMAGE
+        if "TextView" in class_name:
+            kind |= KIND_TEXT
+        if "Button" in class_name:
+            kind |= KIND_BUTTON
+        if any(form_class in class_name for form_class in FORM_CLASS_NAMES):
+            kind |= KIND_FORM
+        return kind
+
     def is_form_element(self, element_data):
         '''Check if element is a form input element'''
-        class_name = element_data["class"]
-        return any(form_class in class_name for form_class in [
-            "EditText", "Spinner", "CheckBox", "RadioButton", "Switch", "SeekBar"
-        ])
+        kind = element_data.get("kind")
+        if kind is None:
+            kind = self.class_kind(element_data["class"])
+        return bool(kind & KIND_FORM)
 
     # ---------------------------
     # Individual Rule Check Methods
     # ---------------------------
     
+    def run_element_checks(self, all_elements, rule_ids):
+        '''Run the cheap per-element rules in rule_ids in a single pass over the elements'''
+        results = {rule_id: [] for rule_id in rule_ids}
+        # Bound append of each requested rule's list; None for rules not requested
+        append_to = {rule_id: rule_issues.append for rule_id, rule_issues in results.items()}
+        text_alternatives = append_to.get("text-alternatives")
+        info_relationships = append_to.get("info-relationships")
+        color_not_only = append_to.get("color-not-only")
+        images_of_text = append_to.get("images-of-text")
+        link_purpose = append_to.get("link-purpose")
+        pointer_gestures = append_to.get("pointer-gestures")
+        label_in_name = append_to.get("label-in-name")
+        name_role_value = append_to.get("name-role-value")
+        missing_labels = append_to.get("missing-labels")
+        image_descriptions = append_to.get("image-descriptions")
+        form_labels = append_to.get("form-labels")
+        button_purpose = append_to.get("button-purpose")
+        # Resolve each rule's priority once rather than per issue
+        priorities = {rule_id: self.rules[rule_id].get("priority", self.ELEMENT_RULES[rule_id]) for rule_id in rule_ids}
+        
+        def issue(rule_id, message, element, guideline):
+            return {
+                "rule": rule_id,
+                "priority": priorities[rule_id],
+                "message": message,
+                "bounds": element["bounds"],
+                "xpath": element["xpath"],
+                "resource_id": element["resource_id"],
+                "guideline": guideline
+            }
+        
+        for element in all_elements:
+            kind = element["kind"]
+            text = element["text"]
+            content_desc = element["content_desc"]
+            text_lower = element["text_lower"]
+            desc_lower = element["content_desc_lower"]
+            clickable = element["clickable"]
+            is_image = kind & KIND_IMAGE
+            
+            if text_alternatives is not None and is_image and not content_desc and not text:
+                text_alternatives(issue("text-alternatives", "Image element missing text alternative (content description)", element, "WCAG 1.1.1 - Non-text Content"))
+            
+            if info_relationships is not None and clickable and not element["resource_id"] and not content_desc:
+                info_relationships(issue("info-relationships", "Interactive element missing programmatic identification", element, "WCAG 1.3.1 - Info and Relationships"))
+            
+            if color_not_only is not None and text and COLOR_INDICATOR_RE.search(text_lower):
+                color_not_only(issue("color-not-only", "Element may rely solely on color to convey information", element, "WCAG 1.4.1 - Use of Color"))
+            
+            # Heuristic: long descriptions on an image might be text content
+            if images_of_text is not None and is_image and len(content_desc) > 20:
+                images_of_text(issue("images-of-text", "Image appears to contain text that should be real text", element, "WCAG 1.4.5 - Images of Text"))
+            
+            if link_purpose is not None and clickable and text and (text_lower in UNCLEAR_LINK_TEXTS or len(text) < 3):
+                link_purpose(issue("link-purpose", f"Link purpose may be unclear: '{text}'", element, "WCAG 2.4.4 - Link Purpose (In Context)"))
+            
+            if pointer_gestures is not None and element["long_clickable"] and not clickable:
+                pointer_gestures(issue("pointer-gestures", "Element requires long-press gesture without simple click alternative", element, "WCAG 2.5.1 - Pointer Gestures"))
+            
+            if label_in_name is not None and text and content_desc and text != content_desc and not texts_overlap(text_lower, desc_lower):
+                label_in_name(issue("label-in-name", f"Visible text '{text}' doesn't match accessible name '{content_desc}'", element, "WCAG 2.5.3 - Label in Name"))
+            
+            if name_role_value is not None and (clickable or element["focusable"]) and not (text or content_desc):
+                name_role_value(issue("name-role-value", "Interactive element missing accessible name", element, "WCAG 4.1.2 - Name, Role, Value"))
+            
+            if missing_labels is not None and clickable and not text and not content_desc:
+                missing_labels(issue("missing-labels", "Clickable element has no visible label or content description", element, "WCAG 1.3.1 - Info and Relationships"))
+            
+            if image_descriptions is not None and is_image and not content_desc:
+                image_descriptions(issue("image-descriptions", "Image missing content description", element, "WCAG 1.1.1 - Non-text Content"))
+            
+            if form_labels is not None and not text and not content_desc and kind & KIND_FORM:
+                form_labels(issue("form-labels", "Form element missing label", element, "WCAG 3.3.2 - Labels or Instructions"))
+            
+            if button_purpose is not None and clickable and kind & KIND_BUTTON and (not text or text_lower in UNCLEAR_BUTTON_TEXTS):
+                button_purpose(issue("button-purpose", f"Button purpose may be unclear: '{text}'", element, "WCAG 2.4.4 - Link Purpose (In Context)"))
+        return results
+
     def check_text_alternatives(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''1.1.1 Text Alternatives - Provide text alternatives for any non-text content'''
-        issues = []
-        for element in all_elements:
-            class_name = element["class"]
-            if "ImageView" in class_name and not element["content_desc"] and not element["text"]:
-                issues.append({
-                    "rule": "text-alternatives",
-                    "priority": self.rules["text-alternatives"].get("priority", "critical"),
-                    "message": "Image element missing text alternative (content description)",
-                    "bounds": element["bounds"],
-                    "xpath": element["xpath"],
-                    "resource_id": element["resource_id"],
-                    "guideline": "WCAG 1.1.1 - Non-text Content"
-                })
-        return issues
+        return self.run_element_checks(all_elements, ("text-alternatives",))["text-alternatives"]
 
     def check_info_relationships(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''1.3.1 Info and Relationships - Information and relationships must be programmatically determinable'''
-        issues = []
-        for element in all_elements:
-            # Check if important elements have proper identifiers
-            if element["clickable"] and not element["resource_id"] and not element["content_desc"]:
-                issues.append({
-                    "rule": "info-relationships",
-                    "priority": self.rules["info-relationships"].get("priority", "high"),
-                    "message": "Interactive element missing programmatic identification",
-                    "bounds": element["bounds"],
-                    "xpath": element["xpath"],
-                    "resource_id": element["resource_id"],
-                    "guideline": "WCAG 1.3.1 - Info and Relationships"
-                })
-        return issues
+        return self.run_element_checks(all_elements, ("info-relationships",))["info-relationships"]
 
     def check_color_not_only(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''1.4.1 Use of Color - Color should not be the only visual means of conveying information'''
-        issues = []
-        # This would require more sophisticated analysis of visual cues
-        # For now, we can check for elements that might rely solely on color
-        for element in all_elements:
-            text = element["text"]
-            if text and self.is_color_dependent_text(text):
-                issues.append({
-                    "rule": "color-not-only",
-                    "priority": self.rules["color-not-only"].get("priority", "high"),
-                    "message": "Element may rely solely on color to convey information",
-                    "bounds": element["bounds"],
-                    "xpath": element["xpath"],
-                    "resource_id": element["resource_id"],
-                    "guideline": "WCAG 1.4.1 - Use of Color"
-                })
-        return issues
+        return self.run_element_checks(all_elements, ("color-not-only",))["color-not-only"]
 
     def is_color_dependent_text(self, text):
         '''Check if text seems to rely on color cues'''
-        color_indicators = ["red", "green", "blue", "color", "colored", "highlighted", "coloured"]
-        return any(indicator in text.lower() for indicator in color_indicators)
+        return COLOR_INDICATOR_RE.search(text.lower()) is not None
 
     def check_color_contrast(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''1.4.3 Contrast (Minimum) - Ensure sufficient contrast between text and background'''
         issues = []
-        threshold = self.rules["color-contrast"].get("threshold", 4.5)
+        rule_meta = self.rules["color-contrast"]
+        threshold = rule_meta.get("threshold", 4.5)
+        priority = rule_meta.get("priority", "high")
+        append = issues.append
         
-        for element in all_elements:
-            if element["bounds"] and element["text"] and ("TextView" in element["class"] or "Button" in element["class"]):
+        # Only text views and buttons carry text worth measuring
+        for element in ElementTable.wrap(all_elements).bucket(KIND_TEXT | KIND_BUTTON):
+            if element["bounds"] and element["text"]:
                 contrast = self.calculate_color_contrast(screenshot_file, element["bounds"])
                 if contrast and contrast < threshold:
-                    issues.append({
+                    append({
                         "rule": "color-contrast",
-                        "priority": self.rules["color-contrast"].get("priority", "high"),
-                        "message": "Text has insufficient color contrast (" + str(contrast) + ":1)",
+                        "priority": priority,
+                        "message": f"Text has insufficient color contrast ({contrast}:1)",
                         "bounds": element["bounds"],
                         "xpath": element["xpath"],
                         "resource_id": element["resource_id"],
@@ -790,22 +1952,7 @@ class ComprehensiveMobileAccessibilityScanner:
 
     def check_images_of_text(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''1.4.5 Images of Text - Use text instead of images of text when possible'''
-        issues = []
-        for element in all_elements:
-            if "ImageView" in element["class"] and element["content_desc"]:
-                # If an image has text as its description, it might be an image of text
-                desc = element["content_desc"]
-                if len(desc) > 20:  # Heuristic: long descriptions might be text content
-                    issues.append({
-                        "rule": "images-of-text",
-                        "priority": self.rules["images-of-text"].get("priority", "medium"),
-                        "message": "Image appears to contain text that should be real text",
-                        "bounds": element["bounds"],
-                        "xpath": element["xpath"],
-                        "resource_id": element["resource_id"],
-                        "guideline": "WCAG 1.4.5 - Images of Text"
-                    })
-        return issues
+        return self.run_element_checks(all_elements, ("images-of-text",))["images-of-text"]
 
     def check_text_spacing(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''1.4.12 Text Spacing - Ensure text spacing can be adjusted'''
@@ -816,9 +1963,13 @@ class ComprehensiveMobileAccessibilityScanner:
     def check_focus_order(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''2.4.3 Focus Order - Ensure logical focus order'''
         issues = []
+        priority = self.rules["focus-order"].get("priority", "high")
+        append = issues.append
         # Check focusable elements for logical spatial order
         focusable_with_bounds = [e for e in focusable_elements if e["bounds"]]
-        focusable_with_bounds.sort(key=lambda e: (e["bounds"][1], e["bounds"][0]))  # Sort by Y then X
+        if len(focusable_with_bounds) < 2:
+            return issues
+        focusable_with_bounds.sort(key=operator.itemgetter("yx"))  # Sort by Y then X
         
         for i in range(1, len(focusable_with_bounds)):
             prev = focusable_with_bounds[i-1]
@@ -826,9 +1977,9 @@ class ComprehensiveMobileAccessibilityScanner:
             
             # Check if focus order seems illogical (jumping around the screen)
             if self.has_illogical_focus_order(prev, curr):
-                issues.append({
+                append({
                     "rule": "focus-order",
-                    "priority": self.rules["focus-order"].get("priority", "high"),
+                    "priority": priority,
                     "message": "Potential illogical focus order between elements",
                     "bounds": curr["bounds"],
                     "xpath": curr["xpath"],
@@ -847,25 +1998,11 @@ class ComprehensiveMobileAccessibilityScanner:
 
     def check_link_purpose(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''2.4.4 Link Purpose - Make link purpose clear from context'''
-        issues = []
-        for element in clickable_elements:
-            text = element["text"]
-            if text and self.is_unclear_link_text(text):
-                issues.append({
-                    "rule": "link-purpose",
-                    "priority": self.rules["link-purpose"].get("priority", "high"),
-                    "message": "Link purpose may be unclear: '" + text + "'",
-                    "bounds": element["bounds"],
-                    "xpath": element["xpath"],
-                    "resource_id": element["resource_id"],
-                    "guideline": "WCAG 2.4.4 - Link Purpose (In Context)"
-                })
-        return issues
+        return self.run_element_checks(all_elements, ("link-purpose",))["link-purpose"]
 
     def is_unclear_link_text(self, text):
         '''Check if link text is unclear'''
-        unclear_texts = ["click here", "read more", "link", "here", "this", "more info"]
-        return text.lower() in unclear_texts or len(text.strip()) < 3
+        return text.lower() in UNCLEAR_LINK_TEXTS or len(text.strip()) < 3
 
     def check_focus_visible(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''2.4.7 Focus Visible - Ensure keyboard focus is visible'''
@@ -876,47 +2013,15 @@ class ComprehensiveMobileAccessibilityScanner:
 
     def check_pointer_gestures(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''2.5.1 Pointer Gestures - Support alternative input methods for complex gestures'''
-        issues = []
-        # Check for elements that might require complex gestures
-        for element in all_elements:
-            if element["long_clickable"] and not element["clickable"]:
-                issues.append({
-                    "rule": "pointer-gestures",
-                    "priority": self.rules["pointer-gestures"].get("priority", "medium"),
-                    "message": "Element requires long-press gesture without simple click alternative",
-                    "bounds": element["bounds"],
-                    "xpath": element["xpath"],
-                    "resource_id": element["resource_id"],
-                    "guideline": "WCAG 2.5.1 - Pointer Gestures"
-                })
-        return issues
+        return self.run_element_checks(all_elements, ("pointer-gestures",))["pointer-gestures"]
 
     def check_label_in_name(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''2.5.3 Label in Name - Ensure visible labels match accessible names'''
-        issues = []
-        for element in all_elements:
-            visible_text = element["text"]
-            accessible_name = element["content_desc"]
-            
-            if visible_text and accessible_name and visible_text != accessible_name:
-                # Check if they are substantially different
-                if not self.texts_are_similar(visible_text, accessible_name):
-                    issues.append({
-                        "rule": "label-in-name",
-                        "priority": self.rules["label-in-name"].get("priority", "high"),
-                        "message": "Visible text '" + visible_text + "' doesn't match accessible name '" + accessible_name + "'",
-                        "bounds": element["bounds"],
-                        "xpath": element["xpath"],
-                        "resource_id": element["resource_id"],
-                        "guideline": "WCAG 2.5.3 - Label in Name"
-                    })
-        return issues
+        return self.run_element_checks(all_elements, ("label-in-name",))["label-in-name"]
 
     def texts_are_similar(self, text1, text2):
         '''Check if two texts are substantially similar'''
-        t1 = text1.lower().strip()
-        t2 = text2.lower().strip()
-        return t1 in t2 or t2 in t1 or t1 == t2
+        return texts_overlap(text1.lower().strip(), text2.lower().strip())
 
     def check_touch_target_size(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''2.5.5 Target Size - Ensure touch targets are of sufficient size'''
@@ -929,24 +2034,27 @@ class ComprehensiveMobileAccessibilityScanner:
     def _check_target_size(self, all_elements, rule_id, guideline):
         '''Generic target size checker'''
         issues = []
-        min_size = self.rules[rule_id].get("min_size", 44)
+        rule_meta = self.rules[rule_id]
+        min_size = rule_meta.get("min_size", 44)
+        priority = rule_meta.get("priority", "high")
+        append = issues.append
+        table = ElementTable.wrap(all_elements)
         
-        for element in all_elements:
-            if element["bounds"] and element["clickable"]:
-                x1, y1, x2, y2 = element["bounds"]
-                width = x2 - x1
-                height = y2 - y1
-                
-                if width < min_size or height < min_size:
-                    issues.append({
-                        "rule": rule_id,
-                        "priority": self.rules[rule_id].get("priority", "high"),
-                        "message": "Touch target too small " + str(width) + "x" + str(height) + "px (minimum " + str(min_size) + "x" + str(min_size) + "px)",
-                        "bounds": element["bounds"],
-                        "xpath": element["xpath"],
-                        "resource_id": element["resource_id"],
-                        "guideline": guideline
-                    })
+        # Sizes are shared by every target-size rule; only the threshold differs
+        indices, widths, heights = table.target_sizes
+        too_small = (widths < min_size) | (heights < min_size)
+        
+        for index, width, height in zip(indices[too_small].tolist(), widths[too_small].tolist(), heights[too_small].tolist()):
+            element = table[index]
+            append({
+                "rule": rule_id,
+                "priority": priority,
+                "message": f"Touch target too small {width}x{height}px (minimum {min_size}x{min_size}px)",
+                "bounds": element["bounds"],
+                "xpath": element["xpath"],
+                "resource_id": element["resource_id"],
+                "guideline": guideline
+            })
         return issues
 
     def check_page_language(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
@@ -969,24 +2077,7 @@ class ComprehensiveMobileAccessibilityScanner:
 
     def check_name_role_value(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''4.1.2 Name, Role, Value - Expose name, role, and value for all UI components'''
-        issues = []
-        for element in all_elements:
-            if element["clickable"] or element["focusable"]:
-                # Check if essential accessibility properties are present
-                has_name = element["text"] or element["content_desc"]
-                has_role = element["class"]  # Class gives some indication of role
-                
-                if not has_name:
-                    issues.append({
-                        "rule": "name-role-value",
-                        "priority": self.rules["name-role-value"].get("priority", "high"),
-                        "message": "Interactive element missing accessible name",
-                        "bounds": element["bounds"],
-                        "xpath": element["xpath"],
-                        "resource_id": element["resource_id"],
-                        "guideline": "WCAG 4.1.2 - Name, Role, Value"
-                    })
-        return issues
+        return self.run_element_checks(all_elements, ("name-role-value",))["name-role-value"]
 
     # Mobile-specific checks
     def check_mobile_touch_target(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
@@ -996,55 +2087,59 @@ class ComprehensiveMobileAccessibilityScanner:
     # Additional common rule checks
     def check_missing_labels(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''Check for missing labels on interactive elements'''
-        issues = []
-        for element in clickable_elements:
-            if not element["text"] and not element["content_desc"]:
-                issues.append({
-                    "rule": "missing-labels",
-                    "priority": self.rules["missing-labels"].get("priority", "critical"),
-                    "message": "Clickable element has no visible label or content description",
-                    "bounds": element["bounds"],
-                    "xpath": element["xpath"],
-                    "resource_id": element["resource_id"],
-                    "guideline": "WCAG 1.3.1 - Info and Relationships"
-                })
-        return issues
+        return self.run_element_checks(all_elements, ("missing-labels",))["missing-labels"]
 
     def check_image_descriptions(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''Check for images without descriptions'''
-        issues = []
-        for element in all_elements:
-            if "ImageView" in element["class"] and not element["content_desc"]:
-                issues.append({
-                    "rule": "image-descriptions",
-                    "priority": self.rules["image-descriptions"].get("priority", "critical"),
-                    "message": "Image missing content description",
-                    "bounds": element["bounds"],
-                    "xpath": element["xpath"],
-                    "resource_id": element["resource_id"],
-                    "guideline": "WCAG 1.1.1 - Non-text Content"
-                })
-        return issues
+        return self.run_element_checks(all_elements, ("image-descriptions",))["image-descriptions"]
 
     def check_overlapping_elements(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''Check for overlapping interactive elements'''
         issues = []
-        for i in range(len(clickable_elements)):
-            for j in range(i+1, len(clickable_elements)):
-                elem1 = clickable_elements[i]
-                elem2 = clickable_elements[j]
-                
-                if elem1["bounds"] and elem2["bounds"]:
-                    if self.elements_overlap(elem1["bounds"], elem2["bounds"]):
-                        issues.append({
-                            "rule": "overlapping-elements",
-                            "priority": self.rules["overlapping-elements"].get("priority", "medium"),
-                            "message": "Clickable elements overlap and may cause touch errors",
-                            "bounds": elem1["bounds"],
-                            "xpath": elem1["xpath"],
-                            "resource_id": elem1["resource_id"],
-                            "guideline": "WCAG 2.5.1 - Pointer Gestures"
-                        })
+        priority = self.rules["overlapping-elements"].get("priority", "medium")
+        append = issues.append
+        table = ElementTable.wrap(clickable_elements)
+        candidates = np.flatnonzero(table.has_bounds)
+        bounds = table.bounds[candidates]
+        
+        pairs = []
+        if len(candidates) > 1:
+            # Sweep along whichever axis yields fewer interval overlaps: vertical
+            # lists are full-width rows, carousels are full-height columns
+            sweeps = []
+            for lo, hi in ((0, 2), (1, 3)):
+                order = np.argsort(bounds[:, lo], kind="stable")
+                starts = bounds[order, lo]
+                ends = np.searchsorted(starts, bounds[order, hi], side="right")
+                sweeps.append((int(ends.sum()), order, ends, 1 - lo))
+            _, order, ends, other = min(sweeps, key=lambda sweep: sweep[0])
+            sweep_lo, sweep_hi = bounds[order, other], bounds[order, other + 2]
+            
+            # Everything after position p that starts before p ends overlaps it on
+            # the sweep axis; test the other axis in blocks to bound memory
+            for block in range(0, len(order), OVERLAP_TILE_ROWS):
+                rows = np.arange(block, min(block + OVERLAP_TILE_ROWS, len(order)))
+                lengths = ends[rows] - rows - 1
+                first = np.repeat(rows, lengths)
+                offsets = np.arange(len(first)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+                second = first + 1 + offsets
+                hit = (sweep_hi[first] >= sweep_lo[second]) & (sweep_hi[second] >= sweep_lo[first])
+                pairs.append(np.sort(np.stack([order[first[hit]], order[second[hit]]], axis=1), axis=1))
+        
+        if pairs:
+            pairs = np.concatenate(pairs)
+            # Report in the same (i, j) order as a pairwise scan would
+            for i in pairs[np.lexsort((pairs[:, 1], pairs[:, 0])), 0]:
+                elem1 = table[candidates[i]]
+                append({
+                    "rule": "overlapping-elements",
+                    "priority": priority,
+                    "message": "Clickable elements overlap and may cause touch errors",
+                    "bounds": elem1["bounds"],
+                    "xpath": elem1["xpath"],
+                    "resource_id": elem1["resource_id"],
+                    "guideline": "WCAG 2.5.1 - Pointer Gestures"
+                })
         return issues
 
     def elements_overlap(self, bounds1, bounds2):
@@ -1058,57 +2153,63 @@ class ComprehensiveMobileAccessibilityScanner:
 
     def check_form_labels(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''Check form elements have proper labels'''
-        issues = []
-        for element in form_elements:
-            if not element["text"] and not element["content_desc"]:
-                issues.append({
-                    "rule": "form-labels",
-                    "priority": self.rules["form-labels"].get("priority", "high"),
-                    "message": "Form element missing label",
-                    "bounds": element["bounds"],
-                    "xpath": element["xpath"],
-                    "resource_id": element["resource_id"],
-                    "guideline": "WCAG 3.3.2 - Labels or Instructions"
-                })
-        return issues
+        return self.run_element_checks(all_elements, ("form-labels",))["form-labels"]
 
     def check_button_purpose(self, all_elements, clickable_elements, focusable_elements, form_elements, screenshot_file):
         '''Check button purposes are clear'''
-        issues = []
-        for element in clickable_elements:
-            if "Button" in element["class"]:
-                text = element["text"]
-                if not text or self.is_unclear_button_text(text):
-                    issues.append({
-                        "rule": "button-purpose",
-                        "priority": self.rules["button-purpose"].get("priority", "high"),
-                        "message": "Button purpose may be unclear: '" + text + "'",
-                        "bounds": element["bounds"],
-                        "xpath": element["xpath"],
-                        "resource_id": element["resource_id"],
-                        "guideline": "WCAG 2.4.4 - Link Purpose (In Context)"
-                    })
-        return issues
+        return self.run_element_checks(all_elements, ("button-purpose",))["button-purpose"]
 
     def is_unclear_button_text(self, text):
         '''Check if button text is unclear'''
-        unclear_texts = ["submit", "ok", "cancel", "yes", "no", "click", "button"]
-        return text.lower() in unclear_texts or len(text.strip()) == 0
+        return text.lower() in UNCLEAR_BUTTON_TEXTS or len(text.strip()) == 0
 
     # ---------------------------
     # Screenshot and Report Methods
     # ---------------------------
     
-    def create_element_screenshot(self, screenshot_file, bounds, issue_type, priority, index):
-        if not screenshot_file or not os.path.exists(screenshot_file) or not bounds:
+    @classmethod
+    def _load_font(cls, size):
+        '''Issue-number font at the given size, loaded once and shared by all scanners'''
+        font = cls._fonts.get(size)
+        if font is None:
+            from PIL import ImageFont
+            try:
+                font = ImageFont.truetype("arial.ttf", size)
+            except OSError:
+                logger.debug("arial.ttf not available, using the default font")
+                font = ImageFont.load_default()
+            cls._fonts[size] = font
+        return font
+
+    def create_element_screenshot(self, screenshot_file, bounds, issue_type, priority, index, base_img=None):
+        if not screenshot_file or not bounds:
+            return None
+        if base_img is None and not os.path.exists(screenshot_file):
             return None
             
+        from PIL import ImageDraw
+        
         try:
-            img = Image.open(screenshot_file).convert("RGBA")
-            draw = ImageDraw.Draw(img, "RGBA")
+            # Callers marking many issues pass the decoded screenshot in, so the PNG
+            # is only decoded once per scan rather than once per element
+            if base_img is None:
+                base_img = Image.open(screenshot_file).convert("RGBA")
             
             x1, y1, x2, y2 = bounds
             
+            # Crop to element area with some padding first, then draw the marker into
+            # the crop only, shifted by its top-left corner
+            padding = 20
+            crop_area = (
+                max(0, x1 - padding),
+                max(0, y1 - padding),
+                min(base_img.width, x2 + padding),
+                min(base_img.height, y2 + padding)
+            )
+            element_img = base_img.crop(crop_area)
+            draw = ImageDraw.Draw(element_img, "RGBA")
+            x1, y1, x2, y2 = x1 - crop_area[0], y1 - crop_area[1], x2 - crop_area[0], y2 - crop_area[1]
+            
             # Color mapping for different priorities
             color_map = {
                 "critical": (231, 76, 60, 180),    # Red
@@ -1123,11 +2224,7 @@ class ComprehensiveMobileAccessibilityScanner:
             draw.rectangle([x1, y1, x2, y2], outline=color, width=6)
             
             # Draw issue number
-            try:
-                font = ImageFont.truetype("arial.ttf", 24)
-            except:
-                font = ImageFont.load_default()
-                
+            font = self._load_font(24)
             text = str(index)
             text_bbox = draw.textbbox((0, 0), text, font=font)
             text_width = text_bbox[2] - text_bbox[0]
@@ -1140,17 +2237,6 @@ class ComprehensiveMobileAccessibilityScanner:
             # Draw text
             draw.text((x1+6, y1+6), text, fill=(0, 0, 0, 255), font=font)
             
-            # Crop to element area with some padding
-            padding = 20
-            crop_area = (
-                max(0, x1 - padding),
-                max(0, y1 - padding),
-                min(img.width, x2 + padding),
-                min(img.height, y2 + padding)
-            )
-            
-            element_img = img.crop(crop_area)
-            
             # Save the element screenshot
             el_file = screenshot_file.replace(".png", "_element_" + str(index) + ".png")
             element_img.save(el_file, "PNG")
@@ -1158,23 +2244,22 @@ class ComprehensiveMobileAccessibilityScanner:
             return el_file
             
         except Exception as e:
-            print("Error creating element screenshot: " + str(e))
+            logger.warning("Error creating element screenshot: %s", e)
             return None
 
     def mark_screenshot(self, screenshot_file, issues):
         if not screenshot_file or not os.path.exists(screenshot_file):
-            print("Screenshot file not found: " + screenshot_file)
+            logger.warning("Screenshot file not found: %s", screenshot_file)
             return None
             
+        from PIL import ImageDraw
+        
         try:
-            img = Image.open(screenshot_file).convert("RGBA")
+            base_img = Image.open(screenshot_file).convert("RGBA")
+            img = base_img.copy()
             draw = ImageDraw.Draw(img, "RGBA")
             
-            # Try to load a font, fall back to default if not available
-            try:
-                font = ImageFont.truetype("arial.ttf", 20)
-            except:
-                font = ImageFont.load_default()
+            font = self._load_font(20)
             
             color_map = {
                 "critical": (231, 76, 60, 180),    # Red
@@ -1213,7 +2298,8 @@ class ComprehensiveMobileAccessibilityScanner:
                     b, 
                     issue["rule"], 
                     issue["priority"], 
-                    i+1
+                    i+1,
+                    base_img=base_img
                 )
                 if element_file:
                     issue["element_screenshot"] = element_file
@@ -1223,7 +2309,7 @@ class ComprehensiveMobileAccessibilityScanner:
             return defected_file
             
         except Exception as e:
-            print("Error marking screenshot: " + str(e))
+            logger.error("Error marking screenshot: %s", e)
             return None
 
     def group_issues_by_rule(self, issues_list):
@@ -1231,26 +2317,56 @@ class ComprehensiveMobileAccessibilityScanner:
         grouped = {}
         for issue in issues_list:
             rule = issue["rule"]
-            if rule not in grouped:
-                grouped[rule] = {
-                    'rule': rule,
-                    'priority': issue['priority'],
-                    'description': self.rules.get(rule, {}).get('description', 'No description available.'),
-                    'guideline': self.rules.get(rule, {}).get('guideline', ''),
-                    'wcag_description': self.rules.get(rule, {}).get('wcag_description', ''),
-                    'why_it_matters': self.rules.get(rule, {}).get('why_it_matters', ''),
-                    'how_to_fix': self.rules.get(rule, {}).get('how_to_fix', ''),
-                    'success_criteria': self.rules.get(rule, {}).get('success_criteria', ''),
-                    'talkback_critical': self.rules.get(rule, {}).get('talkback_critical', False),
-                    'instances': []
-                }
-            grouped[rule]['instances'].append(issue)
+            group = grouped.get(rule)
+            if group is None:
+                group = grouped[rule] = self._new_issue_group(rule, issue['priority'])
+            group['instances'].append(issue)
         return grouped
 
-    def generate_report(self, issues, screenshot_file):
-        # Enhanced to include WCAG coverage information
+    def group_issues_by_priority(self, issues_list):
+        '''Group issues by priority, then by rule, in a single pass; unknown priorities are dropped'''
+        by_priority = {priority: {} for priority in ("critical", "high", "medium", "low")}
+        for issue in issues_list:
+            grouped = by_priority.get(issue["priority"])
+            if grouped is None:
+                continue
+            rule = issue["rule"]
+            group = grouped.get(rule)
+            if group is None:
+                group = grouped[rule] = self._new_issue_group(rule, issue['priority'])
+            group['instances'].append(issue)
+        return by_priority
+
+    def _new_issue_group(self, rule, priority):
+        '''Empty issue group for a rule, carrying its descriptive metadata'''
+        rule_config = self.rules.get(rule, {})
+        return {
+            'rule': rule,
+            'priority': priority,
+            'description': rule_config.get('description', 'No description available.'),
+            'guideline': rule_config.get('guideline', ''),
+            'wcag_description': rule_config.get('wcag_description', ''),
+            'why_it_matters': rule_config.get('why_it_matters', ''),
+            'how_to_fix': rule_config.get('how_to_fix', ''),
+            'success_criteria': rule_config.get('success_criteria', ''),
+            'talkback_critical': rule_config.get('talkback_critical', False),
+            'instances': []
+        }
+
+    def generate_report(self, issues, screenshot_file, pretty=False, compress=False, external_assets=False):
+        # Enhanced to include WCAG coverage information.
+        # The JSON report is compact unless pretty is set
+        # With compress set the HTML report is written gzip-compressed to <report>.html.gz
+        # With external_assets set element screenshots are copied next to the report and linked, not inlined
         json_file = os.path.join(self.report_dir, self.report_file_base)
         html_file = json_file.replace(".json",".html")
+        # One clock read serves both the JSON timestamp and the HTML footer
+        generated_at = datetime.now()
+        if compress:
+            html_file += ".gz"
+        if external_assets:
+            assets_dir = os.path.join(os.path.dirname(html_file), "assets")
+            os.makedirs(assets_dir, exist_ok=True)
 
         # Calculate coverage statistics based on found issues
         covered_guidelines = set()
@@ -1282,900 +2398,243 @@ class ComprehensiveMobileAccessibilityScanner:
             "talkback_evaluation": self.talkback_evaluation,
             "analysis_results": self.analysis_results,
             "wcag_coverage": self.wcag_coverage,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": generated_at.isoformat()
         }
         
-        with open(json_file,"w") as f:
-            json.dump(report_data, f, indent=2)
-
-        # Prepare screenshot for HTML
-        screenshot_b64 = ""
-        if screenshot_file and os.path.exists(screenshot_file):
-            with open(screenshot_file,"rb") as f:
-                screenshot_b64 = base64.b64encode(f.read()).decode("utf-8")
-
-        # Generate HTML report
-        html = ["<!DOCTYPE html><html lang='en'><head>"]
-        html.append("<meta charset='UTF-8'>")
-        html.append("<meta name='viewport' content='width=device-width, initial-scale=1.0'>")
-        html.append("<title>Mobile Accessibility Audit Report</title>")
-        html.append("<link rel='stylesheet' href='https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css'>")
-        html.append("<style>")
-        html.append('''
-            :root {
-                --critical: #dc3545;
-                --high: #fd7e14;
-                --medium: #ffc107;
-                --low: #6c757d;
-                --success: #28a745;
-                --primary: #007bff;
-                --light: #f8f9fa;
-                --dark: #343a40;
-                --talkback-good: #28a745;
-                --talkback-moderate: #ffc107;
-                --talkback-limited: #fd7e14;
-                --talkback-poor: #dc3545;
-            }
-            
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            
-            body {
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-                min-height: 100vh;
-            }
-            
-            .container {
-                max-width: 1200px;
-                margin: 0 auto;
-                padding: 20px;
-            }
-            
-            header {
-                background: white;
-                border-radius: 12px;
-                padding: 30px;
-                margin-bottom: 30px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                text-align: center;
-            }
-            
-            .logo {
-                font-size: 2.5rem;
-                color: var(--primary);
-                margin-bottom: 10px;
-            }
-            
-            h1 {
-                color: var(--dark);
-                margin-bottom: 10px;
-                font-size: 2.2rem;
-            }
-            
-            .subtitle {
-                color: #6c757d;
-                font-size: 1.1rem;
-                margin-bottom: 20px;
-            }
-            
-            .talkback-evaluation-card {
-                background: white;
-                border-radius: 12px;
-                padding: 25px;
-                margin-bottom: 30px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                border-left: 6px solid;
-            }
-            
-            .talkback-evaluation-card.good { border-left-color: var(--talkback-good); }
-            .talkback-evaluation-card.moderate { border-left-color: var(--talkback-moderate); }
-            .talkback-evaluation-card.limited { border-left-color: var(--talkback-limited); }
-            .talkback-evaluation-card.poor { border-left-color: var(--talkback-poor); }
-            
-            .talkback-header {
-                display: flex;
-                align-items: center;
-                gap: 15px;
-                margin-bottom: 20px;
-            }
-            
-            .talkback-icon {
-                font-size: 2rem;
-            }
-            
-            .talkback-good .talkback-icon { color: var(--talkback-good); }
-            .talkback-moderate .talkback-icon { color: var(--talkback-moderate); }
-            .talkback-limited .talkback-icon { color: var(--talkback-limited); }
-            .talkback-poor .talkback-icon { color: var(--talkback-poor); }
-            
-            .talkback-title {
-                font-size: 1.5rem;
-                color: var(--dark);
-            }
-            
-            .talkback-status {
-                font-size: 1.2rem;
-                font-weight: bold;
-                padding: 5px 15px;
-                border-radius: 20px;
-                display: inline-block;
-                margin-left: 10px;
-            }
-            
-            .talkback-good .talkback-status { 
-                background: var(--talkback-good); 
-                color: white;
-            }
-            .talkback-moderate .talkback-status { 
-                background: var(--talkback-moderate); 
-                color: black;
-            }
-            .talkback-limited .talkback-status { 
-                background: var(--talkback-limited); 
-                color: white;
-            }
-            .talkback-poor .talkback-status { 
-                background: var(--talkback-poor); 
-                color: white;
-            }
-            
-            .talkback-details {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 20px;
-                margin-top: 15px;
-            }
-            
-            .talkback-detail {
-                background: #f8f9fa;
-                padding: 15px;
-                border-radius: 8px;
-                border-left: 4px solid;
-            }
-            
-            .talkback-good .talkback-detail { border-left-color: var(--talkback-good); }
-            .talkback-moderate .talkback-detail { border-left-color: var(--talkback-moderate); }
-            .talkback-limited .talkback-detail { border-left-color: var(--talkback-limited); }
-            .talkback-poor .talkback-detail { border-left-color: var(--talkback-poor); }
-            
-            .talkback-detail-label {
-                font-weight: 600;
-                color: var(--dark);
-                margin-bottom: 5px;
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-            
-            .talkback-score {
-                font-size: 2rem;
-                font-weight: bold;
-                text-align: center;
-                margin: 10px 0;
-            }
-            
-            .talkback-good .talkback-score { color: var(--talkback-good); }
-            .talkback-moderate .talkback-score { color: var(--talkback-moderate); }
-            .talkback-limited .talkback-score { color: var(--talkback-limited); }
-            .talkback-poor .talkback-score { color: var(--talkback-poor); }
-            
-            .talkback-warning {
-                background: #fff3cd;
-                border-left: 4px solid #ffc107;
-                padding: 15px;
-                border-radius: 6px;
-                margin-top: 15px;
-            }
-            
-            .talkback-warning h4 {
-                color: #856404;
-                margin-bottom: 5px;
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-            
-            .score-card {
-                background: white;
-                border-radius: 12px;
-                padding: 25px;
-                text-align: center;
-                margin-bottom: 30px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            }
-            
-            .score-value {
-                font-size: 4rem;
-                font-weight: bold;
-                margin: 20px 0;
-            }
-            
-            .score-excellent { color: var(--success); }
-            .score-good { color: var(--medium); }
-            .score-poor { color: var(--high); }
-            .score-critical { color: var(--critical); }
-            
-            .summary-cards {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-            }
-            
-            .summary-card {
-                background: white;
-                border-radius: 12px;
-                padding: 20px;
-                text-align: center;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                transition: transform 0.3s ease;
-            }
-            
-            .summary-card:hover {
-                transform: translateY(-5px);
-            }
-            
-            .summary-card.critical { border-top: 6px solid var(--critical); }
-            .summary-card.high { border-top: 6px solid var(--high); }
-            .summary-card.medium { border-top: 6px solid var(--medium); }
-            .summary-card.low { border-top: 6px solid var(--low); }
-            
-            .summary-count {
-                font-size: 2.5rem;
-                font-weight: bold;
-                margin: 10px 0;
-            }
-            
-            .summary-card.critical .summary-count { color: var(--critical); }
-            .summary-card.high .summary-count { color: var(--high); }
-            .summary-card.medium .summary-count { color: var(--medium); }
-            .summary-card.low .summary-count { color: var(--low); }
-            
-            .screenshot-section {
-                background: white;
-                border-radius: 12px;
-                padding: 25px;
-                margin-bottom: 30px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            }
-            
-            .screenshot-container {
-                text-align: center;
-                margin-top: 15px;
-                position: relative;
-            }
-            
-            .screenshot-img {
-                max-width: 100%;
-                max-height: 600px;
-                object-fit: contain;
-                border-radius: 8px;
-                box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-                border: 2px solid #dee2e6;
-            }
-            
-            .image-size {
-                position: absolute;
-                bottom: 10px;
-                right: 10px;
-                background: rgba(0,0,0,0.7);
-                color: white;
-                padding: 4px 8px;
-                border-radius: 4px;
-                font-size: 0.8rem;
-            }
-            
-            .issues-section {
-                background: white;
-                border-radius: 12px;
-                padding: 25px;
-                margin-bottom: 30px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            }
-            
-            .section-title {
-                color: var(--dark);
-                margin-bottom: 20px;
-                padding-bottom: 10px;
-                border-bottom: 2px solid #e9ecef;
-                display: flex;
-                align-items: center;
-                gap: 10px;
-            }
-            
-            .section-title i {
-                font-size: 1.5rem;
-            }
-            
-            .priority-section {
-                margin-bottom: 30px;
-            }
-            
-            .priority-title {
-                color: var(--dark);
-                margin: 25px 0 15px 0;
-                padding-bottom: 8px;
-                border-bottom: 2px solid #e9ecef;
-                display: flex;
-                align-items: center;
-                gap: 10px;
-            }
-            
-            .issue {
-                border-radius: 8px;
-                margin: 15px 0;
-                overflow: hidden;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            }
-            
-            .issue.critical { border-left: 6px solid var(--critical); }
-            .issue.high { border-left: 6px solid var(--high); }
-            .issue.medium { border-left: 6px solid var(--medium); }
-            .issue.low { border-left: 6px solid var(--low); }
-            
-            .accordion-header {
-                background: var(--light);
-                padding: 20px;
-                cursor: pointer;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                transition: background 0.3s ease;
-            }
-            
-            .accordion-header:hover {
-                background: #e9ecef;
-            }
-            
-            .issue-title {
-                display: flex;
-                align-items: center;
-                gap: 10px;
-                font-weight: 600;
-            }
-            
-            .issue-icon {
-                font-size: 1.2rem;
-            }
-            
-            .issue.critical .issue-icon { color: var(--critical); }
-            .issue.high .issue-icon { color: var(--high); }
-            .issue.medium .issue-icon { color: var(--medium); }
-            .issue.low .issue-icon { color: var(--low); }
-            
-            .accordion-icon {
-                transition: transform 0.3s ease;
-            }
-            
-            .accordion.active .accordion-icon {
-                transform: rotate(180deg);
-            }
-            
-            .accordion-content {
-                display: none;
-                padding: 20px;
-                background: white;
-                border-top: 1px solid #e9ecef;
-            }
-            
-            .accordion.active .accordion-content {
-                display: block;
-            }
-            
-            .issue-details {
-                display: grid;
-                grid-template-columns: 1fr 1fr;
-                gap: 20px;
-                margin-bottom: 15px;
-            }
-            
-            @media (max-width: 768px) {
-                .issue-details {
-                    grid-template-columns: 1fr;
-                }
-            }
-            
-            .detail-group {
-                margin-bottom: 10px;
-            }
-            
-            .detail-label {
-                font-weight: 600;
-                color: #6c757d;
-                margin-bottom: 5px;
-            }
-            
-            .element-screenshot {
-                max-width: 300px;
-                max-height: 300px;
-                object-fit: contain;
-                border-radius: 6px;
-                border: 2px solid #dee2e6;
-                margin: 10px 0;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }
-            
-            .copy-btn {
-                background: var(--primary);
-                color: white;
-                border: none;
-                padding: 5px 10px;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 0.8rem;
-                margin-left: 10px;
-                transition: background 0.3s ease;
-            }
-            
-            .copy-btn:hover {
-                background: #0056b3;
-            }
-            
-            .xpath-container {
-                background: #f8f9fa;
-                padding: 10px;
-                border-radius: 4px;
-                border: 1px solid #e9ecef;
-                font-family: monospace;
-                font-size: 0.9rem;
-                word-break: break-all;
-                margin-top: 5px;
-            }
-            
-            .issue-count {
-                background: #6c757d;
-                color: white;
-                padding: 2px 8px;
-                border-radius: 12px;
-                font-size: 0.8rem;
-                margin-left: 10px;
-            }
-            
-            .all-instances {
-                margin-top: 15px;
-            }
-            
-            .instance-item {
-                margin: 15px 0;
-                padding: 15px;
-                background: #f8f9fa;
-                border-radius: 6px;
-                border-left: 3px solid #dee2e6;
-            }
-            
-            .instance-accordion {
-                margin: 10px 0;
-                border: 1px solid #dee2e6;
-                border-radius: 6px;
-                overflow: hidden;
-            }
-            
-            .instance-header {
-                background: #f8f9fa;
-                padding: 12px 15px;
-                cursor: pointer;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                transition: background 0.3s ease;
-            }
-            
-            .instance-header:hover {
-                background: #e9ecef;
-            }
-            
-            .instance-title {
-                font-weight: 600;
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-            
-            .instance-icon {
-                font-size: 1rem;
-                color: #6c757d;
-            }
-            
-            .instance-content {
-                display: none;
-                padding: 15px;
-                background: white;
-                border-top: 1px solid #dee2e6;
-            }
-            
-            .instance-accordion.active .instance-content {
-                display: block;
-            }
-            
-            .instance-screenshot {
-                max-width: 250px;
-                max-height: 250px;
-                object-fit: contain;
-                border-radius: 4px;
-                border: 1px solid #dee2e6;
-                margin: 8px 0;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            }
-            
-            .wcag-info {
-                background: #e7f3ff;
-                border-radius: 6px;
-                padding: 15px;
-                margin: 15px 0;
-                border-left: 4px solid var(--primary);
-            }
-            
-            .wcag-section {
-                margin: 10px 0;
-            }
-            
-            .wcag-section h4 {
-                color: var(--primary);
-                margin-bottom: 5px;
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-            
-            .wcag-section p {
-                margin-left: 25px;
-            }
-            
-            .guideline-badge {
-                background: var(--primary);
-                color: white;
-                padding: 4px 8px;
-                border-radius: 4px;
-                font-size: 0.8rem;
-                font-weight: 600;
-                margin-left: 10px;
-            }
-            
-            .success-criteria {
-                background: #28a745;
-                color: white;
-                padding: 2px 6px;
-                border-radius: 3px;
-                font-size: 0.7rem;
-                margin-left: 8px;
-            }
-            
-            .talkback-critical-badge {
-                background: #dc3545;
-                color: white;
-                padding: 2px 6px;
-                border-radius: 3px;
-                font-size: 0.7rem;
-                margin-left: 8px;
-                font-weight: bold;
-            }
-            
-            footer {
-                text-align: center;
-                padding: 30px;
-                color: #6c757d;
-                font-size: 0.9rem;
-            }
-            
-            .timestamp {
-                margin-top: 10px;
-                font-size: 0.8rem;
-                color: #adb5bd;
-            }
-        ''')
-        html.append("</style>")
-        html.append("</head><body>")
-        
-        html.append("<div class='container'>")
-        
-        # Header
-        html.append("<header>")
-        html.append("<div class='logo'><i class='fas fa-mobile-alt'></i></div>")
-        html.append("<h1>Mobile Accessibility Audit Report</h1>")
-        html.append("<p class='subtitle'>Comprehensive analysis of your mobile application's accessibility compliance</p>")
-        html.append("</header>")
-        
-        # TalkBack Evaluation Card
-        talkback_class = self.talkback_evaluation["support_level"].lower()
-        html.append(f"<div class='talkback-evaluation-card {talkback_class}'>")
-        html.append("<div class='talkback-header'>")
-        html.append(f"<i class='fas fa-assistive-listening-systems talkback-icon'></i>")
-        html.append(f"<h2 class='talkback-title'>TalkBack Support: <span class='talkback-status'>{self.talkback_evaluation['support_level']}</span></h2>")
-        html.append("</div>")
-        
-        html.append(f"<div class='talkback-score'>{self.talkback_evaluation['support_score']}%</div>")
-        
-        html.append("<div class='talkback-details'>")
-        html.append("<div class='talkback-detail'>")
-        html.append("<div class='talkback-detail-label'><i class='fas fa-info-circle'></i> Device Detection</div>")
-        html.append(f"<div>{'Detected' if self.talkback_evaluation['device_detected'] else '⚠️ Not Detected'}</div>")
-        html.append(f"<small>{self.talkback_evaluation['details']}</small>")
-        html.append("</div>")
-        
-        html.append("<div class='talkback-detail'>")
-        html.append("<div class='talkback-detail-label'><i class='fas fa-check-circle'></i> Content Support</div>")
-        html.append(f"<div>{'Supported' if self.talkback_evaluation['content_supported'] else '❌ Not Supported'}</div>")
-        html.append(f"<small>{self.talkback_evaluation['reason']}</small>")
-        html.append("</div>")
-        
-        html.append("<div class='talkback-detail'>")
-        html.append("<div class='talkback-detail-label'><i class='fas fa-bug'></i> Critical Issues</div>")
-        html.append(f"<div>{self.talkback_evaluation['critical_issues']} TalkBack-critical issues</div>")
-        html.append(f"<small>Missing labels: {self.analysis_results['issues_by_rule'].get('missing-labels', 0)}</small>")
-        html.append("</div>")
-        html.append("</div>")
-        
-        # Warning if there are missing labels but TalkBack is marked as supported
+        if orjson:
+            with open(json_file, "wb") as f:
+                f.write(orjson.dumps(report_data, option=orjson.OPT_INDENT_2 if pretty else None))
+        else:
+            with open(json_file, "w", encoding="utf-8") as f:
+                if pretty:
+                    json.dump(report_data, f, indent=2, ensure_ascii=False)
+                else:
+                    json.dump(report_data, f, separators=(",", ":"), ensure_ascii=False)
+
+        # The screenshot is base64-encoded straight into the HTML file when it is written
+        try:
+            has_screenshot = bool(screenshot_file) and os.stat(screenshot_file).st_size > 0
+        except OSError:
+            has_screenshot = False
+
+        # Values for the header, TalkBack evaluation, score and summary cards
+        talkback = self.talkback_evaluation
         missing_labels_count = self.analysis_results['issues_by_rule'].get('missing-labels', 0)
-        if missing_labels_count > 0 and self.talkback_evaluation['content_supported']:
-            html.append("<div class='talkback-warning'>")
-            html.append("<h4><i class='fas fa-exclamation-triangle'></i> Important Note</h4>")
-            html.append(f"<p>Found {missing_labels_count} missing labels. While TalkBack may technically work, users will struggle to navigate and understand unlabeled elements.</p>")
-            html.append("</div>")
-        
-        html.append("</div>")
-        
-        # Score Card
+        # Warning if there are missing labels but TalkBack is marked as supported
+        missing_labels_warning = ""
+        if missing_labels_count > 0 and talkback['content_supported']:
+            missing_labels_warning = REPORT_MISSING_LABELS_WARNING.format(count=missing_labels_count)
+        talkback_critical_cards = ""
+        if talkback['critical_issues'] > 0:
+            talkback_critical_cards = REPORT_TALKBACK_CRITICAL_CARDS.format(count=talkback['critical_issues'])
         score_class = "score-excellent" if audit_score >= 90 else "score-good" if audit_score >= 70 else "score-poor" if audit_score >= 50 else "score-critical"
-        html.append("<div class='score-card'>")
-        html.append("<h2><i class='fas fa-chart-line'></i> Overall Accessibility Score</h2>")
-        html.append(f"<div class='score-value {score_class}'>{audit_score}%</div>")
-        html.append(f"<p>Based on analysis of {total_issues} accessibility issues</p>")
-        html.append("</div>")
-        
-        # Summary Cards
-        html.append("<div class='summary-cards'>")
-        for k, v in summary.items():
-            html.append(f"<div class='summary-card {k}'>")
-            html.append(f"<h3>{k.title()}</h3>")
-            html.append(f"<div class='summary-count'>{v}</div>")
-            html.append("<p>Issues</p>")
-            html.append("</div>")
-        html.append("</div>")
-        
-        # Add TalkBack critical issues summary
-        talkback_critical_count = self.talkback_evaluation['critical_issues']
-        if talkback_critical_count > 0:
-            html.append("<div class='summary-cards'>")
-            html.append(f"<div class='summary-card critical'>")
-            html.append("<h3>TalkBack Critical</h3>")
-            html.append(f"<div class='summary-count'>{talkback_critical_count}</div>")
-            html.append("<p>Issues preventing TalkBack use</p>")
-            html.append("</div>")
-            html.append("</div>")
+
+        # Generate HTML report, writing each fragment straight to a buffered file
+        if compress:
+            html_out = gzip.open(html_file, "wt", encoding="utf-8", compresslevel=6)
+        else:
+            html_out = open(html_file, "w", encoding="utf-8", buffering=1 << 16)
+        with html_out as f:
+            w = f.write
+            w(REPORT_HEAD)
+            w(REPORT_PREAMBLE.format(
+                talkback_class=talkback["support_level"].lower(),
+                support_level=talkback["support_level"],
+                support_score=talkback["support_score"],
+                device_status="Detected" if talkback["device_detected"] else "⚠️ Not Detected",
+                details=escape(talkback["details"]),
+                content_status="Supported" if talkback["content_supported"] else "❌ Not Supported",
+                reason=escape(talkback["reason"]),
+                critical_issues=talkback["critical_issues"],
+                missing_labels=missing_labels_count,
+                missing_labels_warning=missing_labels_warning,
+                score_class=score_class,
+                audit_score=audit_score,
+                total_issues=total_issues,
+                summary_cards="".join(REPORT_SUMMARY_CARD.format(priority=k, title=k.title(), count=v) for k, v in summary.items()),
+                talkback_critical_cards=talkback_critical_cards
+            ))
         
-        # Screenshot Section
-        if screenshot_b64:
-            html.append("<div class='screenshot-section'>")
-            html.append("<h2 class='section-title'><i class='fas fa-camera'></i> Screen Analysis</h2>")
-            html.append("<div class='screenshot-container'>")
-            html.append(f"<img class='screenshot-img' src='data:image/png;base64,{screenshot_b64}' alt='Analyzed screen with accessibility issues highlighted' onload=\"this.nextElementSibling.textContent=this.naturalWidth+' × '+this.naturalHeight\"/>")
-            html.append("<div class='image-size'>Loading dimensions...</div>")
-            html.append("</div>")
-            html.append("</div>")
+            # Screenshot Section
+            if has_screenshot:
+                w("<div class='screenshot-section'>\n")
+                w("<h2 class='section-title'><i class='fas fa-camera'></i> Screen Analysis</h2>\n")
+                w("<div class='screenshot-container'>\n")
+                w("<img class='screenshot-img' src='data:image/png;base64,")
+                stream_base64(screenshot_file, w)
+                w("' alt='Analyzed screen with accessibility issues highlighted' onload=\"this.nextElementSibling.textContent=this.naturalWidth+' × '+this.naturalHeight\"/>\n")
+                w("<div class='image-size'>Loading dimensions...</div>\n")
+                w("</div></div>\n")
         
-        # Issues Section
-        html.append("<div class='issues-section'>")
-        html.append("<h2 class='section-title'><i class='fas fa-search'></i> Detailed Issues</h2>")
+            # Issues Section
+            w("<div class='issues-section'>\n")
+            w("<h2 class='section-title'><i class='fas fa-search'></i> Detailed Issues</h2>\n")
         
-        # Priority icons mapping
-        priority_icons = {
-            "critical": "fas fa-exclamation-circle",
-            "high": "fas fa-exclamation-triangle", 
-            "medium": "fas fa-info-circle",
-            "low": "fas fa-flag"
-        }
+            # Priority icons mapping
+            priority_icons = {
+                "critical": "fas fa-exclamation-circle",
+                "high": "fas fa-exclamation-triangle", 
+                "medium": "fas fa-info-circle",
+                "low": "fas fa-flag"
+            }
         
-        # Display issues by priority level
-        for priority in ["critical", "high", "medium", "low"]:
-            pr_issues = [i for i in issues if i["priority"] == priority]
-            if not pr_issues:
-                continue
+            # Display issues by priority level
+            for priority, grouped_issues in self.group_issues_by_priority(issues).items():
+                if not grouped_issues:
+                    continue
+                priority_count = sum(len(group['instances']) for group in grouped_issues.values())
                 
-            # Group issues by rule within this priority
-            grouped_issues = self.group_issues_by_rule(pr_issues)
-            
-            html.append("<div class='priority-section'>")
-            html.append(f"<h3 class='priority-title' style='color: var({priority});'>")
-            html.append(f"<i class='{priority_icons[priority]}'></i>")
-            html.append(f"{priority.title()} Priority Issues ({len(pr_issues)})")
-            html.append("</h3>")
-            
-            # Display each rule group as a separate accordion
-            rule_index = 0
-            for rule, group in grouped_issues.items():
-                rule_index += 1
-                rule_name = rule.replace('-', ' ').title()
+                # Fragments that only vary by priority, built once per priority
+                priority_icon = priority_icons[priority]
+                accordion_open = f"<div class='accordion issue {priority}'>\n"
+                issue_icon = f"<i class='issue-icon {priority_icon}'></i>\n"
+                xpath_prefix = f"xpath_{priority}_"
+            
+                w("<div class='priority-section'>\n")
+                w(f"<h3 class='priority-title' style='color: var(--{priority});'>\n")
+                w(f"<i class='{priority_icon}'></i>\n")
+                w(f"{priority.title()} Priority Issues ({priority_count})\n")
+                w("</h3>\n")
+            
+                # Display each rule group as a separate accordion
+                rule_index = 0
+                for rule, group in grouped_issues.items():
+                    rule_index += 1
+                    rule_name = rule.replace('-', ' ').title()
+                    # Group fields are read once per group
+                    instances = group['instances']
+                    instance_count = len(instances)
+                    description = group['description']
+                    guideline = group.get('guideline')
+                    success_criteria = group.get('success_criteria')
+                    talkback_critical = group.get('talkback_critical')
+                    wcag_description = group.get('wcag_description')
+                    why_it_matters = group.get('why_it_matters')
+                    how_to_fix = group.get('how_to_fix')
                 
-                html.append("<div class='accordion issue " + priority + "'>")
-                html.append("<div class='accordion-header'>")
-                html.append("<div class='issue-title'>")
-                html.append(f"<i class='issue-icon {priority_icons[priority]}'></i>")
-                html.append(f"{rule_index}. {rule_name}")
-                html.append(f"<span class='issue-count'>{len(group['instances'])}</span>")
-                if group.get('guideline'):
-                    html.append(f"<span class='guideline-badge'>{group['guideline']}</span>")
-                if group.get('success_criteria'):
-                    html.append(f"<span class='success-criteria'>{group['success_criteria']}</span>")
-                if group.get('talkback_critical'):
-                    html.append("<span class='talkback-critical-badge'>TalkBack Critical</span>")
-                html.append("</div>")
-                html.append("<i class='accordion-icon fas fa-chevron-down'></i>")
-                html.append("</div>")
-                html.append("<div class='accordion-content'>")
+                    w(accordion_open)
+                    w("<div class='accordion-header'>\n")
+                    w("<div class='issue-title'>\n")
+                    w(issue_icon)
+                    w(f"{rule_index}. {escape(rule_name)}\n")
+                    w(f"<span class='issue-count'>{instance_count}</span>\n")
+                    if guideline:
+                        w(f"<span class='guideline-badge'>{escape(guideline)}</span>\n")
+                    if success_criteria:
+                        w(f"<span class='success-criteria'>{escape(success_criteria)}</span>\n")
+                    if talkback_critical:
+                        w("<span class='talkback-critical-badge'>TalkBack Critical</span>\n")
+                    w("</div>\n")
+                    w("<i class='accordion-icon fas fa-chevron-down'></i>\n")
+                    w("</div>\n")
+                    w("<div class='accordion-content'>\n")
                 
-                # Rule description
-                html.append(f"<div class='detail-group'><div class='detail-label'>Description</div><div>{group['description']}</div></div>")
+                    # Rule description
+                    w(f"<div class='detail-group'><div class='detail-label'>Description</div><div>{escape(description)}</div></div>\n")
                 
-                # WCAG Information Accordion
-                if group.get('wcag_description'):
-                    html.append("<div class='wcag-info'>")
+                    # WCAG Information Accordion
+                    if wcag_description:
+                        w("<div class='wcag-info'>\n")
                     
-                    html.append("<div class='wcag-section'>")
-                    html.append("<h4><i class='fas fa-book'></i> WCAG Requirement</h4>")
-                    html.append(f"<p>{group['wcag_description']}</p>")
-                    html.append("</div>")
+                        w("<div class='wcag-section'>\n")
+                        w("<h4><i class='fas fa-book'></i> WCAG Requirement</h4>\n")
+                        w(f"<p>{escape(wcag_description)}</p>\n")
+                        w("</div>\n")
                     
-                    if group.get('why_it_matters'):
-                        html.append("<div class='wcag-section'>")
-                        html.append("<h4><i class='fas fa-question-circle'></i> Why This Matters</h4>")
-                        html.append(f"<p>{group['why_it_matters']}</p>")
-                        html.append("</div>")
+                        if why_it_matters:
+                            w("<div class='wcag-section'>\n")
+                            w("<h4><i class='fas fa-question-circle'></i> Why This Matters</h4>\n")
+                            w(f"<p>{escape(why_it_matters)}</p>\n")
+                            w("</div>\n")
                     
-                    if group.get('how_to_fix'):
-                        html.append("<div class='wcag-section'>")
-                        html.append("<h4><i class='fas fa-wrench'></i> How to Fix</h4>")
-                        html.append(f"<p>{group['how_to_fix']}</p>")
-                        html.append("</div>")
+                        if how_to_fix:
+                            w("<div class='wcag-section'>\n")
+                            w("<h4><i class='fas fa-wrench'></i> How to Fix</h4>\n")
+                            w(f"<p>{escape(how_to_fix)}</p>\n")
+                            w("</div>\n")
                     
-                    # Special TalkBack info for TalkBack-critical issues
-                    if group.get('talkback_critical'):
-                        html.append("<div class='wcag-section'>")
-                        html.append("<h4><i class='fas fa-assistive-listening-systems'></i> Impact on TalkBack</h4>")
-                        html.append("<p>This issue critically affects TalkBack users. Without proper labels/descriptions, TalkBack cannot announce elements to visually impaired users.</p>")
-                        html.append("</div>")
+                        # Special TalkBack info for TalkBack-critical issues
+                        if talkback_critical:
+                            w("<div class='wcag-section'>\n")
+                            w("<h4><i class='fas fa-assistive-listening-systems'></i> Impact on TalkBack</h4>\n")
+                            w("<p>This issue critically affects TalkBack users. Without proper labels/descriptions, TalkBack cannot announce elements to visually impaired users.</p>\n")
+                            w("</div>\n")
                     
-                    html.append("</div>")
+                        w("</div>\n")
                 
-                # Display all instances for this rule with instance-level accordions
-                html.append("<div class='all-instances'>")
-                html.append(f"<div class='detail-group'><div class='detail-label'>Found {len(group['instances'])} instance(s):</div></div>")
+                    # Display all instances for this rule with instance-level accordions
+                    w("<div class='all-instances'>\n")
+                    w(f"<div class='detail-group'><div class='detail-label'>Found {instance_count} instance(s):</div></div>\n")
                 
-                for i, instance in enumerate(group['instances']):
-                    instance_num = i + 1
-                    
-                    html.append("<div class='instance-accordion'>")
-                    html.append("<div class='instance-header'>")
-                    html.append("<div class='instance-title'>")
-                    html.append("<i class='instance-icon fas fa-bug'></i>")
-                    html.append(f"Instance {instance_num}: {instance['message']}")
-                    html.append("</div>")
-                    html.append("<i class='accordion-icon fas fa-chevron-down'></i>")
-                    html.append("</div>")
-                    html.append("<div class='instance-content'>")
-                    
-                    html.append("<div class='issue-details'>")
-                    html.append("<div>")
-                    html.append(f"<div class='detail-group'><div class='detail-label'>Issue Details</div><div>{instance['message']}</div></div>")
-                    
-                    # Instance-specific information
-                    html.append("<div class='wcag-info' style='background: #fff3cd; border-left-color: #ffc107;'>")
-                    html.append(f"<div class='detail-group'><div class='detail-label'>WCAG Guideline</div><div>{instance.get('guideline', '')}</div></div>")
-                    if "contrast" in instance:
-                        html.append(f"<div class='detail-group'><div class='detail-label'>Contrast Ratio</div><div>{instance['contrast']}:1 (Minimum recommended: 4.5:1)</div></div>")
-                    if instance.get('talkback_critical'):
-                        html.append("<div class='detail-group'><div class='detail-label'>TalkBack Impact</div><div><strong>Critical:</strong> This prevents TalkBack from functioning properly</div></div>")
-                    html.append("</div>")
-                    
-                    html.append("</div>")
-                    
-                    html.append("<div>")
-                    if instance.get("bounds"):
-                        b = instance["bounds"]
-                        html.append(f"<div class='detail-group'><div class='detail-label'>Element Position</div><div>X:{b[0]}, Y:{b[1]}, Width:{b[2]-b[0]}, Height:{b[3]-b[1]}</div></div>")
-                    if instance.get("xpath"):
-                        xpath_id = f"xpath_{priority}_{rule_index}_{instance_num}"
-                        html.append("<div class='detail-group'><div class='detail-label'>XPath</div>")
-                        html.append(f"<div class='xpath-container' id='{xpath_id}'>{instance['xpath']}</div>")
-                        html.append(f"<button class='copy-btn' onclick=\"copyText('{xpath_id}')\"><i class='fas fa-copy'></i> Copy XPath</button>")
-                        html.append("</div>")
-                    html.append("</div>")
-                    html.append("</div>")
-                    
-                    # Element screenshot
-                    instance_el_screenshot_b64 = ""
-                    if "element_screenshot" in instance and os.path.exists(instance["element_screenshot"]):
-                        with open(instance["element_screenshot"], "rb") as f:
-                            instance_el_screenshot_b64 = base64.b64encode(f.read()).decode("utf-8")
-                    
-                    if instance_el_screenshot_b64:
-                        html.append("<div class='detail-group'><div class='detail-label'>Element Screenshot</div>")
-                        html.append(f"<img class='instance-screenshot' src='data:image/png;base64,{instance_el_screenshot_b64}' alt='Element with accessibility issue - Instance {instance_num}'/>")
-                        html.append("</div>")
-                    
-                    html.append("</div></div>")
+                    for instance_num, instance in enumerate(instances, 1):
+                        message = escape(instance['message'])
+                        
+                        # Optional pieces of the instance block
+                        contrast_html = ""
+                        if "contrast" in instance:
+                            contrast_html = f"<div class='detail-group'><div class='detail-label'>Contrast Ratio</div><div>{instance['contrast']}:1 (Minimum recommended: 4.5:1)</div></div>\n"
+                        talkback_html = ""
+                        if instance.get('talkback_critical'):
+                            talkback_html = "<div class='detail-group'><div class='detail-label'>TalkBack Impact</div><div><strong>Critical:</strong> This prevents TalkBack from functioning properly</div></div>\n"
+                        position_html = ""
+                        if instance.get("bounds"):
+                            b = instance["bounds"]
+                            position_html = f"<div class='detail-group'><div class='detail-label'>Element Position</div><div>X:{b[0]}, Y:{b[1]}, Width:{b[2]-b[0]}, Height:{b[3]-b[1]}</div></div>\n"
+                        xpath_html = ""
+                        if instance.get("xpath"):
+                            xpath_id = f"{xpath_prefix}{rule_index}_{instance_num}"
+                            xpath_html = (
+                                "<div class='detail-group'><div class='detail-label'>XPath</div>\n"
+                                f"<div class='xpath-container' id='{xpath_id}'>{escape(instance['xpath'])}</div>\n"
+                                f"<button class='copy-btn' onclick=\"copyText('{xpath_id}')\"><i class='fas fa-copy'></i> Copy XPath</button>\n"
+                                "</div>\n"
+                            )
+                        # The instance accordion up to its screenshot in one template fill and one write
+                        w(REPORT_INSTANCE.format(
+                            number=instance_num,
+                            message=message,
+                            guideline=escape(instance.get('guideline', '')),
+                            contrast=contrast_html,
+                            talkback=talkback_html,
+                            position=position_html,
+                            xpath=xpath_html
+                        ))
+                        
+                        # One stat call skips missing and empty files; inline screenshots are
+                        # base64-streamed straight into the report, never held whole in memory
+                        element_screenshot = instance.get("element_screenshot")
+                        try:
+                            st = os.stat(element_screenshot) if element_screenshot else None
+                        except OSError:
+                            st = None
+                        if st and st.st_size > 0:
+                            w(REPORT_INSTANCE_SCREENSHOT)
+                            if external_assets:
+                                asset_name = f"inst_{priority}_{rule_index}_{instance_num}.png"
+                                shutil.copyfile(element_screenshot, os.path.join(assets_dir, asset_name))
+                                w(f"assets/{asset_name}")
+                                img_attrs = "loading='lazy' decoding='async' "
+                            else:
+                                w("data:image/png;base64,")
+                                stream_base64(element_screenshot, w)
+                                img_attrs = ""
+                            w(REPORT_INSTANCE_SCREENSHOT_END.format(attrs=img_attrs, number=instance_num))
+                        w(REPORT_INSTANCE_END)
                 
-                html.append("</div>")
-                html.append("</div></div>")
+                    w("</div></div></div>\n")
             
-            html.append("</div>")
-        
-        html.append("</div>")
-        
-        html.append("</div>")
+                w("</div>\n")
         
-        # Footer
-        html.append("<footer>")
-        html.append("<p>Design and developed by <b>ACOE</b> - Automation Center of Excellence</p>")
-        html.append(f"<div class='timestamp'>Report generated on {datetime.now().strftime('%Y-%m-%d at %H:%M:%S')}</div>")
-        html.append("</footer>")
+            w("</div></div>\n")
         
-        # JavaScript
-        html.append("<script>")
-        html.append('''
-            function copyText(id){
-                const el = document.getElementById(id);
-                navigator.clipboard.writeText(el.innerText).then(() => {
-                    const btn = event.target;
-                    const originalText = btn.innerHTML;
-                    btn.innerHTML = '<i class="fas fa-check"></i> Copied!';
-                    setTimeout(() => {
-                        btn.innerHTML = originalText;
-                    }, 2000);
-                });
-            }
+            # Footer
+            w(REPORT_FOOTER.format(timestamp=generated_at.strftime('%Y-%m-%d at %H:%M:%S')))
             
-            document.addEventListener('DOMContentLoaded', () => {
-                // Main accordion functionality
-                document.querySelectorAll('.accordion-header').forEach(header => {
-                    header.addEventListener('click', () => {
-                        const accordion = header.parentElement;
-                        accordion.classList.toggle('active');
-                    });
-                });
-                
-                // Instance accordion functionality
-                document.querySelectorAll('.instance-header').forEach(header => {
-                    header.addEventListener('click', () => {
-                        const accordion = header.parentElement;
-                        accordion.classList.toggle('active');
-                    });
-                });
-                
-                // Auto-expand critical issues and TalkBack-critical issues
-                document.querySelectorAll('.issue.critical').forEach(accordion => {
-                    accordion.classList.add('active');
-                    // Also expand first instance of critical issues
-                    const firstInstance = accordion.querySelector('.instance-accordion');
-                    if (firstInstance) {
-                        firstInstance.classList.add('active');
-                    }
-                });
-                
-                // Auto-expand any issues with talkback-critical class
-                document.querySelectorAll('.talkback-critical-badge').forEach(badge => {
-                    const accordion = badge.closest('.accordion');
-                    if (accordion) {
-                        accordion.classList.add('active');
-                    }
-                });
-            });
-        ''')
-        html.append("</script>")
-        
-        html.append("</body></html>")
-
-        with open(html_file, "w", encoding="utf-8") as f:
-            f.write("\n".join(html))
+            # JavaScript
+            w(REPORT_SCRIPT)
 
-        # Return the absolute path to the HTML file
-        return os.path.abspath(html_file)
+        # Return the absolute path to the HTML file; only resolve against the cwd if needed
+        return html_file if os.path.isabs(html_file) else os.path.abspath(html_file)
 
     def run_scan(self):
         # Capture screen state
@@ -2195,5 +2654,5 @@ class ComprehensiveMobileAccessibilityScanner:
 
 # ---------------------------
 if __name__ == "__main__":
-    scanner = ComprehensiveMobileAccessibilityScanner()
-    scanner.run_scan()
+    with ComprehensiveMobileAccessibilityScanner() as scanner:
+        scanner.run_scan()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+from mobileAccessibility import ComprehensiveMobileAccessibilityScanner
+
+
+class ColorContrastTest(unittest.TestCase):
+
+    def setUp(self):
+        # The scanner creates its output directories in the working directory
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.scanner = ComprehensiveMobileAccessibilityScanner()
+
+    def tearDown(self):
+        self.scanner.close()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _screenshot(self, image):
+        path = os.path.join(self._tmp.name, "screen.png")
+        image.save(path)
+        return path
+
+    def test_uniform_region_is_not_measured(self):
+        screenshot = self._screenshot(Image.new("RGB", (100, 100), (200, 30, 30)))
+        self.assertIsNone(self.scanner.calculate_color_contrast(screenshot, (10, 10, 90, 90)))
+
+    def test_black_on_white_region(self):
+        image = Image.new("RGB", (100, 100), (255, 255, 255))
+        image.paste((0, 0, 0), (20, 20, 60, 60))
+        screenshot = self._screenshot(image)
+        self.assertEqual(self.scanner.calculate_color_contrast(screenshot, (0, 0, 100, 100)), 21.0)
+
+
+if __name__ == "__main__":
+    unittest.main()